@@ -3,9 +3,15 @@ Assessment Cache and Video Recommendations System
 Speeds up assessment generation and provides curated video recommendations
 """
 
-import json
+import asyncio
+import os
 import time
-from typing import Dict, List, Optional
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from cache_store import create_cache
+from single_flight import SingleFlight
+from skill_registry import skill_registry
 
 # Pre-generated assessments for common skills (faster than AI generation)
 PREDEFINED_ASSESSMENTS = {
@@ -187,6 +193,45 @@ PREDEFINED_ASSESSMENTS = {
     }
 }
 
+# Single starter questions for skills without a predefined assessment
+STARTER_QUESTIONS = {
+    "JavaScript": {
+        "question": "What is the correct way to declare a variable in JavaScript?",
+        "options": ["var x = 5;", "variable x = 5;", "v x = 5;", "declare x = 5;"],
+        "correct_answer": "var x = 5;",
+        "explanation": "var is the traditional way to declare variables in JavaScript"
+    },
+    "Python": {
+        "question": "Which of the following is used to create a list in Python?",
+        "options": ["[]", "()", "{}", "<>"],
+        "correct_answer": "[]",
+        "explanation": "Square brackets [] are used to create lists in Python"
+    },
+    "Java": {
+        "question": "What is the main method signature in Java?",
+        "options": [
+            "public static void main(String[] args)",
+            "public void main(String[] args)",
+            "static void main(String[] args)",
+            "public static main(String[] args)"
+        ],
+        "correct_answer": "public static void main(String[] args)",
+        "explanation": "The main method must be public, static, and return void"
+    },
+    "React": {
+        "question": "What hook is used to manage state in functional components?",
+        "options": ["useState", "useEffect", "useContext", "useReducer"],
+        "correct_answer": "useState",
+        "explanation": "useState is the primary hook for managing state in functional components"
+    },
+    "SQL": {
+        "question": "Which SQL command is used to retrieve data from a database?",
+        "options": ["SELECT", "INSERT", "UPDATE", "DELETE"],
+        "correct_answer": "SELECT",
+        "explanation": "SELECT is used to retrieve data from database tables"
+    }
+}
+
 # Curated video recommendations for skills
 VIDEO_RECOMMENDATIONS = {
     "Python": [
@@ -239,69 +284,132 @@ VIDEO_RECOMMENDATIONS = {
     ]
 }
 
+# Generated assessments kept for 24 hours, bounded with LRU eviction
+ASSESSMENT_CACHE_TTL_SECONDS = float(os.getenv("ASSESSMENT_CACHE_TTL_SECONDS", "86400"))
+ASSESSMENT_CACHE_MAX_SIZE = int(os.getenv("ASSESSMENT_CACHE_MAX_SIZE", "1000"))
+
 # Assessment cache to avoid regenerating
-assessment_cache = {}
+assessment_cache = create_cache("assessments", ASSESSMENT_CACHE_MAX_SIZE, ASSESSMENT_CACHE_TTL_SECONDS)
+
+# How long one worker may hold the generation lease for a skill before others take over
+ASSESSMENT_LEASE_SECONDS = float(os.getenv("ASSESSMENT_LEASE_SECONDS", "45"))
+
+# How often workers waiting on another worker's generation re-check the cache
+ASSESSMENT_LEASE_POLL_SECONDS = float(os.getenv("ASSESSMENT_LEASE_POLL_SECONDS", "0.25"))
+
+# Concurrent misses in this worker share one generation per (skill, difficulty)
+assessment_flights = SingleFlight()
+
+# Identifies this worker's leases in the shared store
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+def assessment_cache_key(skill: str, difficulty: str) -> str:
+    return f"{skill_registry.cache_key(skill)}_{difficulty}"
 
 def get_cached_assessment(skill: str, difficulty: str = "intermediate") -> Optional[Dict]:
     """Get cached assessment if available"""
-    cache_key = f"{skill}_{difficulty}"
-    if cache_key in assessment_cache:
-        cached = assessment_cache[cache_key]
-        # Check if cache is still valid (24 hours)
-        if time.time() - cached["timestamp"] < 86400:
-            return cached["assessment"]
-    return None
+    return assessment_cache.get(assessment_cache_key(skill, difficulty))
 
 def cache_assessment(skill: str, difficulty: str, assessment: Dict):
     """Cache an assessment"""
-    cache_key = f"{skill}_{difficulty}"
-    assessment_cache[cache_key] = {
-        "assessment": assessment,
-        "timestamp": time.time()
-    }
+    assessment_cache.set(assessment_cache_key(skill, difficulty), assessment)
+
+def get_cached_skill_questions(skill: str, difficulty: str) -> List[Dict]:
+    """Every cached question for one skill: its single-skill assessment plus questions
+    kept from multi-skill generations"""
+    questions = []
+    cached = get_cached_assessment(skill, difficulty)
+    if cached:
+        questions.extend(question for question in cached.get("questions", [])
+                         if skill_registry.cache_key(question.get("skill") or skill) == skill_registry.cache_key(skill))
+    pool = assessment_cache.get(f"{assessment_cache_key(skill, difficulty)}_questions")
+    if pool:
+        questions.extend(pool["questions"])
+    return questions
+
+# Questions kept per skill from multi-skill generations
+SKILL_QUESTION_POOL_SIZE = int(os.getenv("SKILL_QUESTION_POOL_SIZE", "20"))
+
+def cache_skill_questions(skill: str, difficulty: str, questions: List[Dict]):
+    """Add one skill's share of a multi-skill generation to its cached pool (newest kept)"""
+    key = f"{assessment_cache_key(skill, difficulty)}_questions"
+    pool = {question["question"]: question for question in (assessment_cache.peek(key) or {}).get("questions", [])}
+    for question in questions:
+        pool.pop(question["question"], None)
+        pool[question["question"]] = question
+    assessment_cache.set(key, {
+        "questions": list(pool.values())[-SKILL_QUESTION_POOL_SIZE:],
+        "created_at": int(time.time())
+    })
+
+def get_assessment_cache_stats() -> Dict:
+    """Hit/miss/eviction counters for the assessment cache"""
+    return dict(assessment_cache.stats(), single_flight=assessment_flights.stats())
+
+def is_fresh(assessment: Optional[Dict], refresh_within: float = 0) -> bool:
+    """True if a cached assessment won't expire within refresh_within seconds"""
+    if not assessment:
+        return False
+    if refresh_within <= 0:
+        return True
+    expires_at = assessment.get("created_at", 0) + assessment_cache.ttl
+    return expires_at - time.time() > refresh_within
+
+async def get_or_generate_assessment(skill: str, difficulty: str,
+                                     generate: Callable[[], Awaitable[Dict]],
+                                     refresh_within: float = 0) -> Dict:
+    """Cached assessment for a skill, generating it at most once across concurrent misses
+
+    Misses in this worker join one in-flight generation. Across workers the
+    generating worker holds a lease in the shared cache store while the others
+    poll the cache for its result; if the lease lapses without a result they
+    take it over. generate() returns the assessment, with a "source" other
+    than "fallback" or "ai_partial" (a truncated generation) when it is worth
+    caching. With refresh_within, entries
+    expiring sooner than that are regenerated (used by pre-warming).
+    """
+    cached = assessment_cache.peek(assessment_cache_key(skill, difficulty)) if refresh_within \
+        else get_cached_assessment(skill, difficulty)
+    if is_fresh(cached, refresh_within):
+        return cached
+    key = assessment_cache_key(skill, difficulty)
+    return await assessment_flights.run(
+        key, lambda: _generate_under_lease(key, skill, difficulty, generate, refresh_within)
+    )
+
+async def _generate_under_lease(key: str, skill: str, difficulty: str,
+                                generate: Callable[[], Awaitable[Dict]], refresh_within: float) -> Dict:
+    deadline = time.monotonic() + ASSESSMENT_LEASE_SECONDS
+    while not assessment_cache.acquire_lease(key, WORKER_ID, ASSESSMENT_LEASE_SECONDS):
+        await asyncio.sleep(ASSESSMENT_LEASE_POLL_SECONDS)
+        cached = assessment_cache.peek(key)
+        if is_fresh(cached, refresh_within):
+            return cached
+        if time.monotonic() > deadline:
+            # The lease holder is stuck; generate rather than wait on it forever
+            break
+
+    try:
+        # Another worker may have finished between our miss and taking the lease
+        cached = assessment_cache.peek(key)
+        if is_fresh(cached, refresh_within):
+            return cached
+        assessment = await generate()
+        if assessment.get("source", "fallback") not in ("fallback", "ai_partial"):
+            cache_assessment(skill, difficulty, assessment)
+        return assessment
+    finally:
+        assessment_cache.release_lease(key, WORKER_ID)
 
 def get_predefined_assessment(skill: str) -> Optional[Dict]:
     """Get predefined assessment for common skills"""
-    skill_lower = skill.lower()
-    
-    # Map skill names to predefined assessments
-    skill_mapping = {
-        "python": "Python",
-        "javascript": "JavaScript", 
-        "js": "JavaScript",
-        "react": "React",
-        "reactjs": "React",
-        "sql": "SQL",
-        "mysql": "SQL",
-        "postgresql": "SQL"
-    }
-    
-    mapped_skill = skill_mapping.get(skill_lower)
-    if mapped_skill and mapped_skill in PREDEFINED_ASSESSMENTS:
-        return PREDEFINED_ASSESSMENTS[mapped_skill]
-    
-    return None
+    # Variants ('reactjs', 'Postgres') resolve through the registry; MySQL etc. fall back to SQL
+    return skill_registry.lookup(PREDEFINED_ASSESSMENTS, skill)
 
 def get_video_recommendations(skill: str, score: float) -> List[Dict]:
     """Get curated video recommendations for a skill"""
-    skill_lower = skill.lower()
-    
-    # Map skill names to video recommendations
-    skill_mapping = {
-        "python": "Python",
-        "javascript": "JavaScript",
-        "js": "JavaScript", 
-        "react": "React",
-        "reactjs": "React",
-        "sql": "SQL",
-        "mysql": "SQL",
-        "postgresql": "SQL"
-    }
-    
-    mapped_skill = skill_mapping.get(skill_lower)
-    if mapped_skill and mapped_skill in VIDEO_RECOMMENDATIONS:
-        videos = VIDEO_RECOMMENDATIONS[mapped_skill]
-        
+    videos = skill_registry.lookup(VIDEO_RECOMMENDATIONS, skill)
+    if videos:
         # If score is low, recommend more videos
         if score < 40:  # Changed from 60 to 40 to recommend videos for scores below 40%
             return videos
@@ -0,0 +1,80 @@
+"""
+Assessment Grading
+Answer keys precomputed at generation time and a single-pass grading routine
+"""
+
+from typing import Dict, List
+
+# Skills scoring below this percentage are reported as weak
+WEAK_SKILL_THRESHOLD = 40
+
+
+def build_answer_key(assessment: Dict) -> Dict[str, Dict]:
+    """Index an assessment's questions by ID: {question_id: {correct_answer, skill}}"""
+    return {
+        question["id"]: {
+            "correct_answer": question.get("correct_answer"),
+            "skill": question.get("skill")
+        }
+        for question in assessment.get("questions", [])
+    }
+
+
+def get_answer_key(assessment: Dict) -> Dict[str, Dict]:
+    """Stored answer key, built on the fly for assessments saved without one"""
+    return assessment.get("answer_key") or build_answer_key(assessment)
+
+
+def grade_submission(answer_key: Dict[str, Dict], answers: Dict[str, str]) -> Dict:
+    """Grade submitted answers in one pass
+
+    Returns overall and per-skill scores. As before, the score is taken over
+    the submitted answers and unknown question IDs count as incorrect.
+    """
+    checked_answers = {}
+    skill_totals = {}
+    correct_answers = 0
+
+    for question_id, user_answer in answers.items():
+        entry = answer_key.get(question_id)
+        is_correct = entry is not None and user_answer == entry["correct_answer"]
+        checked_answers[question_id] = "correct" if is_correct else "incorrect"
+        if is_correct:
+            correct_answers += 1
+
+        if entry is not None and entry["skill"]:
+            totals = skill_totals.setdefault(entry["skill"], [0, 0])
+            totals[0] += is_correct
+            totals[1] += 1
+
+    total_questions = len(answers)
+    return {
+        "score": (correct_answers / total_questions) * 100 if total_questions > 0 else 0,
+        "correct_answers": correct_answers,
+        "total_questions": total_questions,
+        "checked_answers": checked_answers,
+        "skill_scores": {
+            skill: {
+                "correct": correct,
+                "total": total,
+                "score": (correct / total) * 100
+            }
+            for skill, (correct, total) in skill_totals.items()
+        }
+    }
+
+
+def skill_score(skill: str, skill_scores: Dict[str, Dict], overall_score: float) -> float:
+    """A skill's own score, or the overall score if none of its questions were answered"""
+    entry = skill_scores.get(skill)
+    return entry["score"] if entry else overall_score
+
+
+def find_weak_skills(skills: List[str], skill_scores: Dict[str, Dict], overall_score: float,
+                     threshold: float = WEAK_SKILL_THRESHOLD) -> List[str]:
+    """Skills scoring under the threshold, judged per skill rather than on the aggregate"""
+    candidates = list(skills) + [skill for skill in skill_scores if skill not in skills]
+    return [
+        skill for skill in candidates
+        if skill_score(skill, skill_scores, overall_score) < threshold
+    ]
@@ -0,0 +1,208 @@
+"""
+Assessment Pre-warming
+Tracks how often each (skill, difficulty) is requested and regenerates the
+most popular assessments before their cache entries expire, at startup and
+during an off-peak window, within a per-run LLM budget.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from assessment_cache import get_or_generate_assessment, get_predefined_assessment
+from cache_store import create_cache
+from skill_registry import skill_registry
+
+# Most-requested (skill, difficulty) pairs kept warm
+ASSESSMENT_PREWARM_TOP_N = int(os.getenv("ASSESSMENT_PREWARM_TOP_N", "20"))
+
+# Maximum LLM generations per pre-warm run
+ASSESSMENT_PREWARM_LLM_BUDGET = int(os.getenv("ASSESSMENT_PREWARM_LLM_BUDGET", "10"))
+
+# Seconds between pre-warm checks inside the off-peak window
+ASSESSMENT_PREWARM_INTERVAL_SECONDS = float(os.getenv("ASSESSMENT_PREWARM_INTERVAL_SECONDS", "900"))
+
+# Seconds after startup before the first run, so it doesn't compete with boot traffic
+ASSESSMENT_PREWARM_STARTUP_DELAY_SECONDS = float(os.getenv("ASSESSMENT_PREWARM_STARTUP_DELAY_SECONDS", "30"))
+
+# Off-peak window as UTC hours "start-end" (end exclusive, may wrap past midnight)
+ASSESSMENT_PREWARM_OFF_PEAK_HOURS = os.getenv("ASSESSMENT_PREWARM_OFF_PEAK_HOURS", "1-5")
+
+# Skills warmed even before any requests have been seen, e.g. "Kubernetes,Docker"
+ASSESSMENT_PREWARM_SKILLS = os.getenv("ASSESSMENT_PREWARM_SKILLS", "")
+
+# Request counts halve over this many seconds, so popularity follows recent demand
+ASSESSMENT_DEMAND_HALF_LIFE_SECONDS = float(os.getenv("ASSESSMENT_DEMAND_HALF_LIFE_SECONDS", str(3 * 86400)))
+
+DEMAND_KEY = "counts"
+
+
+def parse_off_peak_hours(spec: str) -> Tuple[int, int]:
+    """'1-5' -> (1, 5); raises ValueError for anything else"""
+    start, end = (int(part) for part in spec.split("-"))
+    if not (0 <= start < 24 and 0 <= end < 24) or start == end:
+        raise ValueError(f"Invalid off-peak hours: {spec}")
+    return start, end
+
+
+def in_window(hour: int, window: Tuple[int, int]) -> bool:
+    start, end = window
+    return start <= hour < end if start < end else hour >= start or hour < end
+
+
+def next_window_start(now: datetime, window: Tuple[int, int]) -> datetime:
+    """Start of the next off-peak window strictly after now"""
+    start = now.replace(hour=window[0], minute=0, second=0, microsecond=0)
+    return start if start > now else start + timedelta(days=1)
+
+
+class AssessmentDemand:
+    """Exponentially decayed request counts per (skill, difficulty)
+
+    Counts live in this worker and are merged into a shared cache entry on
+    every pre-warm run, so popularity survives restarts and is seen by all
+    workers using the same cache backend.
+    """
+
+    def __init__(self, half_life: float = ASSESSMENT_DEMAND_HALF_LIFE_SECONDS, store=None):
+        self.half_life = half_life
+        self.store = store
+        self._scores: Dict[str, Tuple[float, float]] = {}  # "skill|difficulty" -> (score, updated_at)
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+
+    def record(self, skill: str, difficulty: str, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        key = f"{skill_registry.normalize(skill)}|{difficulty}"
+        score, updated_at = self._scores.get(key, (0.0, now))
+        self._scores[key] = (self._decayed(score, updated_at, now) + 1, now)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """The n most-requested (skill, difficulty) pairs, most popular first"""
+        now = time.time() if now is None else now
+        ranked = sorted(
+            self._scores.items(),
+            key=lambda item: self._decayed(item[1][0], item[1][1], now),
+            reverse=True
+        )
+        return [tuple(key.split("|", 1)) for key, _ in ranked[:n]]
+
+    def sync(self, now: Optional[float] = None):
+        """Merge with the shared snapshot, keeping the higher decayed score per key"""
+        if self.store is None:
+            return
+        now = time.time() if now is None else now
+        shared = self.store.peek(DEMAND_KEY) or {}
+        merged = {}
+        for key in set(shared) | set(self._scores):
+            scores = [self._decayed(*entry, now) for entry in (shared.get(key), self._scores.get(key)) if entry]
+            merged[key] = (max(scores), now)
+        self._scores = merged
+        self.store.set(DEMAND_KEY, {key: list(entry) for key, entry in merged.items()})
+
+
+class AssessmentPrewarmer:
+    """Regenerates popular assessments before they expire
+
+    generate(skill, difficulty) builds an uncached single-skill assessment;
+    every call counts against the LLM budget, so skills served from the
+    predefined bank are skipped.
+    """
+
+    def __init__(self, generate: Callable[[str, str], Awaitable[Dict]], demand: AssessmentDemand,
+                 top_n: int = ASSESSMENT_PREWARM_TOP_N, llm_budget: int = ASSESSMENT_PREWARM_LLM_BUDGET,
+                 interval: float = ASSESSMENT_PREWARM_INTERVAL_SECONDS,
+                 off_peak_hours: str = ASSESSMENT_PREWARM_OFF_PEAK_HOURS,
+                 seed_skills: str = ASSESSMENT_PREWARM_SKILLS):
+        self.generate = generate
+        self.demand = demand
+        self.top_n = top_n
+        self.llm_budget = llm_budget
+        self.interval = interval
+        self.off_peak = parse_off_peak_hours(off_peak_hours)
+        self.seed_skills = skill_registry.normalize_skills(seed_skills.split(","))
+        self.runs = 0
+        self.generated = 0
+        self.last_run = None
+
+    def candidates(self) -> List[Tuple[str, str]]:
+        popular = self.demand.top(len(self.demand))
+        seeds = [(skill, "intermediate") for skill in self.seed_skills if (skill, "intermediate") not in popular]
+        return [
+            (skill, difficulty) for skill, difficulty in popular + seeds
+            if not get_predefined_assessment(skill)
+        ][:self.top_n]
+
+    def refresh_horizon(self, now: datetime) -> float:
+        """Seconds until the run after this one; entries expiring sooner are refreshed now"""
+        next_run = now + timedelta(seconds=self.interval)
+        if not in_window(next_run.hour, self.off_peak):
+            next_run = next_window_start(now, self.off_peak)
+        return (next_run - now).total_seconds() + self.interval
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict:
+        """Refresh the top-N entries that would expire before the next run"""
+        now = now or datetime.now(timezone.utc)
+        self.demand.sync()
+        refresh_within = self.refresh_horizon(now)
+        budget = self.llm_budget
+        refreshed = []
+
+        for skill, difficulty in self.candidates():
+            if budget <= 0:
+                break
+            calls = []
+
+            async def generate_counted(skill=skill, difficulty=difficulty):
+                calls.append(1)
+                return await self.generate(skill, difficulty)
+
+            try:
+                await get_or_generate_assessment(skill, difficulty, generate_counted, refresh_within)
+            except Exception as e:
+                print(f"⚠️ Pre-warming {skill} ({difficulty}) failed: {e}")
+            if calls:
+                budget -= 1
+                refreshed.append(f"{skill} ({difficulty})")
+
+        self.runs += 1
+        self.generated += len(refreshed)
+        self.last_run = now.isoformat()
+        if refreshed:
+            print(f"🔥 Pre-warmed {len(refreshed)} assessments: {', '.join(refreshed)}")
+        return {"refreshed": refreshed, "budget_left": budget}
+
+    async def run(self, startup_delay: float = ASSESSMENT_PREWARM_STARTUP_DELAY_SECONDS):
+        """Run once after startup, then every interval while inside the off-peak window"""
+        await asyncio.sleep(startup_delay)
+        startup = True
+        while True:
+            now = datetime.now(timezone.utc)
+            if startup or in_window(now.hour, self.off_peak):
+                startup = False
+                try:
+                    await self.run_once(now)
+                except Exception as e:
+                    print(f"⚠️ Assessment pre-warm run failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict:
+        return {
+            "top_n": self.top_n,
+            "llm_budget_per_run": self.llm_budget,
+            "off_peak_hours_utc": f"{self.off_peak[0]}-{self.off_peak[1]}",
+            "runs": self.runs,
+            "generated": self.generated,
+            "last_run": self.last_run,
+            "tracked": len(self.demand)
+        }
+
+
+# Demand snapshot shared through the configured cache backend; kept a month
+assessment_demand = AssessmentDemand(store=create_cache("assessment_demand", 1, 30 * 86400))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixed LLM and database traffic through the FastAPI app
+
+Runs LLM-backed /generate_assessment requests (fake model with fixed latency)
+alongside admin and login requests against a seeded SQLite database, first
+with the old blocking data-access calls made straight from the handlers,
+then with the async data-access layer the endpoints now await. Each SQL
+statement pays a simulated network round trip, as it would against Postgres.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+USERS = 500
+LOGIN_LOGS = 100000
+LLM_REQUESTS = 16
+DB_REQUESTS = 48
+FAKE_LLM_LATENCY_SECONDS = 0.5
+DB_ROUND_TRIP_MS = 2
+
+db_path = os.path.join(tempfile.mkdtemp(), "benchmark_async_db.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import database_utils
+from database_async import async_engine
+from database_models import Session, User, UserLoginLog, engine, init_db
+from llm_gateway import LLMGateway
+from sqlalchemy import event, insert
+from sqlalchemy.util import await_only
+
+FAKE_ASSESSMENT = (
+    '{"assessment_id": "fake", "title": "Technical Skills Assessment", "difficulty": "intermediate", '
+    '"skills_tested": ["Go"], "questions": [{"id": "q1", "skill": "Go", "question": "?", '
+    '"options": ["go", "async"], "correct_answer": "go", "explanation": ""}]}'
+)
+
+
+class FakeAsyncCohere:
+    """Answers generate() like cohere.AsyncClient after a fixed delay"""
+
+    async def generate(self, **kwargs):
+        await asyncio.sleep(FAKE_LLM_LATENCY_SECONDS)
+        return SimpleNamespace(generations=[SimpleNamespace(text=FAKE_ASSESSMENT)])
+
+
+def seed():
+    init_db()
+    now = datetime.utcnow()
+    session = Session()
+    session.execute(insert(User), [
+        {"id": f"user{i}", "email": f"user{i}@example.com", "display_name": f"User {i}",
+         "role": "user", "created_at": now, "last_login": now, "login_count": 1}
+        for i in range(USERS)
+    ])
+    session.execute(insert(UserLoginLog), [
+        {"user_id": f"user{i % USERS}", "login_timestamp": now - timedelta(seconds=i), "browser": "Chrome"}
+        for i in range(LOGIN_LOGS)
+    ])
+    session.commit()
+    session.close()
+
+
+def simulate_round_trips():
+    """Sleep DB_ROUND_TRIP_MS per statement in the thread running the driver call"""
+    def round_trip(statement):
+        time.sleep(DB_ROUND_TRIP_MS / 1000)
+
+    @event.listens_for(engine, "connect")
+    def sync_connect(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(round_trip)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def async_connect(dbapi_connection, connection_record):
+        # aiosqlite runs statements (and so the callback) on its own worker thread
+        await_only(dbapi_connection.driver_connection.set_trace_callback(round_trip))
+
+
+def use_blocking_data_access(backend):
+    """The previous handlers: sync database_utils calls made on the event loop"""
+    def blocking(func):
+        async def call(*args, **kwargs):
+            return func(*args, **kwargs)
+        return call
+
+    for name in ("get_all_users_with_login_data", "get_login_logs_with_users", "record_user_login",
+                 "get_dashboard_metrics", "get_user", "save_assessment_session"):
+        setattr(backend, name, blocking(getattr(database_utils, name)))
+
+
+async def timed(request):
+    start = time.perf_counter()
+    response = await request
+    return response.status_code, time.perf_counter() - start
+
+
+async def mixed_traffic(app):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+        llm = [
+            timed(client.post("/generate_assessment", json={"skills": ["Go", f"Skill{i}"]}))
+            for i in range(LLM_REQUESTS)
+        ]
+        db = []
+        for i in range(DB_REQUESTS):
+            if i % 3 == 0:
+                db.append(timed(client.get("/api/users/logins")))
+            elif i % 3 == 1:
+                db.append(timed(client.get("/api/users/login-logs", params={"limit": 100})))
+            else:
+                db.append(timed(client.post("/api/users/login", json={
+                    "uid": f"user{i}", "email": f"user{i}@example.com", "displayName": f"User {i}"
+                })))
+        start = time.perf_counter()
+        results = await asyncio.gather(*llm, *db)
+        elapsed = time.perf_counter() - start
+    llm_latencies = [latency for _, latency in results[:LLM_REQUESTS]]
+    failed = sum(1 for status, _ in results if status != 200)
+    return elapsed, llm_latencies, failed
+
+
+async def run(label, backend):
+    backend.llm_gateway = LLMGateway(async_client=FakeAsyncCohere())
+    await backend.app.router.startup()
+    try:
+        elapsed, llm_latencies, failed = await mixed_traffic(backend.app)
+    finally:
+        await backend.app.router.shutdown()
+    print(f"   {label:<22} total {elapsed:6.2f}s   LLM p50 {statistics.median(llm_latencies):5.2f}s   "
+          f"LLM max {max(llm_latencies):5.2f}s   failed {failed}")
+
+
+def main():
+    seed()
+    engine.dispose()
+    simulate_round_trips()
+    os.environ.setdefault("COHERE_API_KEY", "fake-key")
+    import main as backend
+
+    print(f"⚡ Mixed traffic: {LLM_REQUESTS} LLM requests ({FAKE_LLM_LATENCY_SECONDS}s) + {DB_REQUESTS} DB requests")
+    print(f"   SQLite with {USERS} users, {LOGIN_LOGS} login logs, {DB_ROUND_TRIP_MS}ms per statement")
+    print("=" * 60)
+
+    asyncio.run(run("Async data access:", backend))
+
+    use_blocking_data_access(backend)
+    asyncio.run(run("Blocking data access:", backend))
+
+
+if __name__ == "__main__":
+    main()
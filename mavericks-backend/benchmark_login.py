@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark the login write path: separate sessions per step vs one transaction
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+LOGINS = 300
+USERS = 50
+
+db_path = os.path.join(tempfile.mkdtemp(), "benchmark_login.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_models import init_db
+from database_utils import (
+    get_user_by_email, update_user_login, create_user, save_login_log,
+    update_dashboard_metrics, record_user_login
+)
+
+
+def login_payload(i):
+    user = i % USERS
+    return {
+        "uid": f"user{user}",
+        "email": f"user{user}@example.com",
+        "displayName": f"User {user}",
+        "role": "user",
+        "loginTimestamp": "2026-01-01T09:00:00Z",
+        "deviceInfo": {"browser": "Chrome", "os": "Linux", "platform": "web"},
+        "ipAddress": "127.0.0.1"
+    }
+
+
+def legacy_login(data):
+    """The previous path: four sessions and commits per login"""
+    user = get_user_by_email(data["email"])
+    if user:
+        update_user_login(user.id)
+    else:
+        create_user(data)
+    save_login_log(data)
+    update_dashboard_metrics()
+
+
+def run(label, login):
+    start = time.perf_counter()
+    for i in range(LOGINS):
+        login(login_payload(i))
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<24} {LOGINS / elapsed:8.1f} logins/s")
+
+
+def main():
+    init_db()
+    print(f"🔐 Login write path benchmark ({LOGINS} logins, {USERS} users, SQLite)")
+    print("=" * 60)
+    run("Separate sessions:", legacy_login)
+    run("Single transaction:", record_user_login)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass skill matcher against the old per-skill regex loop
+"""
+
+import re
+import time
+
+from skill_matcher import SKILL_PATTERNS, SKILL_ALIASES, SkillMatcher, skill_matcher
+
+SAMPLE_RESUME = """
+SOFTWARE ENGINEER
+
+SKILLS:
+- Python, JavaScript, React, Node.js, C++, C#
+- SQL, MongoDB, AWS, SQL Server
+- Machine Learning, TensorFlow, scikit-learn
+- Docker, Kubernetes, Git, React Native
+
+EXPERIENCE:
+- Developed web applications using React and Node.js
+- Implemented machine learning models with Python and TensorFlow
+- Deployed applications using Docker and AWS
+"""
+
+
+def legacy_extract(text, vocabulary):
+    """The previous implementation: one re.search per vocabulary entry"""
+    found_skills = set()
+    text_lower = text.lower()
+    for skills in vocabulary.values():
+        for skill in skills:
+            pattern = r'\b' + re.escape(skill.lower()) + r'(?!\w)'
+            if re.search(pattern, text_lower):
+                found_skills.add(SKILL_ALIASES.get(skill.lower(), skill.title()))
+    return sorted(found_skills)
+
+
+def synthetic_vocabulary(size):
+    """Real vocabulary padded with generated skill names"""
+    vocabulary = {category: list(skills) for category, skills in SKILL_PATTERNS.items()}
+    vocabulary['synthetic'] = [f"framework{i}x" for i in range(size)]
+    return vocabulary
+
+
+def time_call(func, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print("🔬 Skill matcher benchmark")
+    print("=" * 60)
+
+    legacy = legacy_extract(SAMPLE_RESUME, SKILL_PATTERNS)
+    matched = skill_matcher.find_skills(SAMPLE_RESUME)
+    print(f"✅ Results match legacy extraction: {legacy == matched}")
+    print(f"   Skills: {matched}")
+
+    print("\n📄 Scaling with resume length (default vocabulary)")
+    for copies in (1, 10, 100):
+        text = SAMPLE_RESUME * copies
+        legacy_ms = time_call(legacy_extract, text, SKILL_PATTERNS)
+        matcher_ms = time_call(skill_matcher.find_skills, text)
+        print(f"   {len(text):>7} chars: legacy {legacy_ms:8.2f}ms | matcher {matcher_ms:8.2f}ms")
+
+    print("\n📚 Scaling with vocabulary size (10x resume)")
+    text = SAMPLE_RESUME * 10
+    for size in (0, 1000, 5000):
+        vocabulary = synthetic_vocabulary(size)
+        matcher = SkillMatcher(vocabulary, SKILL_ALIASES)
+        legacy_ms = time_call(legacy_extract, text, vocabulary, repeat=1)
+        matcher_ms = time_call(matcher.find_skills, text)
+        print(f"   {len(matcher.canonical):>5} skills: legacy {legacy_ms:8.2f}ms | matcher {matcher_ms:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
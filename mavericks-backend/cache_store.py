@@ -0,0 +1,345 @@
+"""
+Cache Store
+Bounded key/value cache with LRU + TTL eviction, hit/miss/eviction counters
+and pluggable backends (in-process, on-disk SQLite, Redis protocol)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Backend used by create_cache: memory, sqlite or redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+
+# On-disk location for the sqlite backend (shared by every worker on the host)
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "./mavericks_cache.db")
+
+# Redis-protocol server for the redis backend (any compatible local stand-in works)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+# Seconds between background sweeps of expired entries
+CACHE_SWEEP_SECONDS = float(os.getenv("CACHE_SWEEP_SECONDS", "300"))
+
+
+class MemoryCacheBackend:
+    """Per-process OrderedDict kept in LRU order"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._leases = {}  # key -> (owner, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Dict, ttl: float) -> int:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            return len(expired)
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            held = self._leases.get(key)
+            if held is not None and held[1] > now and held[0] != owner:
+                return False
+            self._leases[key] = (owner, now + ttl)
+            return True
+
+    def release_lease(self, key: str, owner: str):
+        with self._lock:
+            held = self._leases.get(key)
+            if held is not None and held[0] == owner:
+                del self._leases[key]
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """On-disk cache table; survives restarts and is shared across workers"""
+
+    def __init__(self, max_size: int, namespace: str, path: str = CACHE_SQLITE_PATH):
+        self.max_size = max_size
+        self.table = "cache_" + re.sub(r"\W", "_", namespace)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at ON {self.table} (accessed_at)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_expires_at ON {self.table} (expires_at)")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table}_leases ("
+            "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict, ttl: float) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now)
+            )
+            overflow = self.size() - self.max_size
+            if overflow <= 0:
+                return 0
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            return overflow
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def sweep(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            # One statement, so two workers can't both take a free or expired lease
+            return self._conn.execute(
+                f"INSERT INTO {self.table}_leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE expires_at <= ? OR owner = excluded.owner",
+                (key, owner, now + ttl, now)
+            ).rowcount == 1
+
+    def release_lease(self, key: str, owner: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}_leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def size(self) -> int:
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+
+class RedisCacheBackend:
+    """Redis-protocol store; TTL via SETEX, LRU order kept in a sorted set"""
+
+    def __init__(self, max_size: int, namespace: str, url: str = CACHE_REDIS_URL, client=None):
+        if client is None:
+            if redis is None:
+                raise ImportError("The redis package is required for the redis cache backend")
+            client = redis.Redis.from_url(url)
+            client.ping()
+        self.client = client
+        self.max_size = max_size
+        self.prefix = f"{namespace}:"
+        self.lru_key = f"{namespace}:__lru__"
+        self.lease_prefix = f"{namespace}:__lease__:"
+
+    def get(self, key: str) -> Optional[Dict]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.client.zrem(self.lru_key, key)
+            return None
+        self.client.zadd(self.lru_key, {key: time.time()})
+        return json.loads(raw)
+
+    def set(self, key: str, value: Dict, ttl: float) -> int:
+        pipe = self.client.pipeline()
+        pipe.setex(self.prefix + key, max(1, int(ttl)), json.dumps(value))
+        pipe.zadd(self.lru_key, {key: time.time()})
+        pipe.zcard(self.lru_key)
+        overflow = pipe.execute()[-1] - self.max_size
+        if overflow <= 0:
+            return 0
+        evicted = [member.decode() if isinstance(member, bytes) else member
+                   for member, _ in self.client.zpopmin(self.lru_key, overflow)]
+        self.client.delete(*[self.prefix + member for member in evicted])
+        return len(evicted)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+        self.client.zrem(self.lru_key, key)
+
+    def sweep(self) -> int:
+        # Redis expires the values itself; drop LRU entries whose value is gone
+        removed = 0
+        for member in self.client.zrange(self.lru_key, 0, -1):
+            member = member.decode() if isinstance(member, bytes) else member
+            if not self.client.exists(self.prefix + member):
+                self.client.zrem(self.lru_key, member)
+                removed += 1
+        return removed
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        return bool(self.client.set(self.lease_prefix + key, owner, nx=True, px=max(1, int(ttl * 1000))))
+
+    def release_lease(self, key: str, owner: str):
+        # Only the holder releases; a lease that expired and moved on is left alone
+        held = self.client.get(self.lease_prefix + key)
+        if held is not None and (held.decode() if isinstance(held, bytes) else held) == owner:
+            self.client.delete(self.lease_prefix + key)
+
+    def size(self) -> int:
+        return self.client.zcard(self.lru_key)
+
+    def clear(self):
+        members = self.client.zrange(self.lru_key, 0, -1)
+        keys = [self.prefix + (m.decode() if isinstance(m, bytes) else m) for m in members]
+        self.client.delete(self.lru_key, *keys)
+
+
+class BoundedCache:
+    """Cache front end: TTL policy, counters and the background expiry sweep"""
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._sweeper = None
+        self._stop_sweeper = threading.Event()
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def peek(self, key: str) -> Optional[Dict]:
+        """get() without touching the hit/miss counters (for polling and background checks)"""
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None):
+        self.evictions += self.backend.set(key, value, ttl or self.ttl)
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """Take a short-lived lock on key, shared by every worker using the same store"""
+        return self.backend.acquire_lease(key, owner, ttl)
+
+    def release_lease(self, key: str, owner: str):
+        self.backend.release_lease(key, owner)
+
+    def delete(self, key: str):
+        self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+
+    def sweep(self) -> int:
+        removed = self.backend.sweep()
+        self.expirations += removed
+        return removed
+
+    def start_sweeper(self, interval: float = CACHE_SWEEP_SECONDS):
+        """Remove expired entries every interval seconds on a daemon thread"""
+        if self._sweeper is not None:
+            return
+        self._stop_sweeper.clear()
+
+        def run():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"⚠️ Cache sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=run, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop_sweeper.set()
+        self._sweeper = None
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "max_size": self.backend.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+def create_cache(namespace: str, max_size: int, ttl: float, backend: str = CACHE_BACKEND) -> BoundedCache:
+    """Build a cache for namespace using the configured backend
+
+    Falls back to the in-process backend if the shared store is unavailable.
+    """
+    try:
+        if backend == "sqlite":
+            return BoundedCache(SQLiteCacheBackend(max_size, namespace), ttl)
+        if backend == "redis":
+            return BoundedCache(RedisCacheBackend(max_size, namespace), ttl)
+    except Exception as e:
+        print(f"⚠️ {backend} cache backend unavailable ({e}) - using in-memory cache for {namespace}")
+    return BoundedCache(MemoryCacheBackend(max_size), ttl)
@@ -0,0 +1,151 @@
+"""
+Admin Data Export
+Streams users, login logs and chat interactions as NDJSON or CSV straight
+from a server-side cursor, so exports of any size run in constant memory.
+Pages are keyset-paginated on each dataset's sort key and can be limited to
+a date range.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import and_, or_, select
+
+from database_async import AsyncSession
+from database_models import User, UserLoginLog, ChatInteraction
+
+# Rows fetched from the database cursor per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Rows encoded into each chunk written to the response
+EXPORT_CHUNK_ROWS = 500
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Exported columns, keyset sort key and date-range column for each dataset
+EXPORT_DATASETS = {
+    "users": {
+        "columns": [User.id, User.email, User.display_name, User.role, User.login_count,
+                    User.created_at, User.last_login],
+        "keys": [User.id],
+        "time_column": User.created_at
+    },
+    "login_logs": {
+        "columns": [UserLoginLog.id, UserLoginLog.user_id, UserLoginLog.session_id, UserLoginLog.login_timestamp,
+                    UserLoginLog.ip_address, UserLoginLog.browser, UserLoginLog.operating_system,
+                    UserLoginLog.platform, UserLoginLog.language, UserLoginLog.screen_resolution,
+                    UserLoginLog.timezone],
+        "keys": [UserLoginLog.login_timestamp, UserLoginLog.id],
+        "time_column": UserLoginLog.login_timestamp
+    },
+    "chat_interactions": {
+        "columns": [ChatInteraction.id, ChatInteraction.user_id, ChatInteraction.message,
+                    ChatInteraction.response, ChatInteraction.timestamp],
+        "keys": [ChatInteraction.timestamp, ChatInteraction.id],
+        "time_column": ChatInteraction.timestamp
+    }
+}
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC; convert aware query parameters to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_export_cursor(dataset: str, row) -> str:
+    """Cursor for the page after row: its sort key values joined with '|'"""
+    values = [getattr(row, key.key) for key in EXPORT_DATASETS[dataset]["keys"]]
+    return "|".join(value.isoformat() if isinstance(value, datetime) else str(value) for value in values)
+
+
+def decode_export_cursor(dataset: str, cursor: str) -> List:
+    """Parse a cursor back into typed sort key values; raises ValueError if malformed"""
+    keys = EXPORT_DATASETS[dataset]["keys"]
+    parts = cursor.rsplit("|", len(keys) - 1)
+    if len(parts) != len(keys):
+        raise ValueError("Cursor does not match the dataset's sort key")
+    values = []
+    for key, part in zip(keys, parts):
+        python_type = key.type.python_type
+        values.append(datetime.fromisoformat(part) if python_type is datetime else python_type(part))
+    return values
+
+
+def keyset_after(keys: Sequence, values: Sequence):
+    """(k1, k2, ...) > (v1, v2, ...) spelled out so every database can use the index"""
+    condition = keys[-1] > values[-1]
+    for key, value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+        condition = or_(key > value, and_(key == value, condition))
+    return condition
+
+
+def export_query(dataset: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 after: Optional[Sequence] = None, limit: Optional[int] = None):
+    spec = EXPORT_DATASETS[dataset]
+    query = select(*spec["columns"])
+    if start:
+        query = query.where(spec["time_column"] >= to_utc_naive(start))
+    if end:
+        query = query.where(spec["time_column"] <= to_utc_naive(end))
+    if after:
+        query = query.where(keyset_after(spec["keys"], after))
+    query = query.order_by(*spec["keys"])
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+async def stream_export_rows(dataset: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                             after: Optional[Sequence] = None, limit: Optional[int] = None,
+                             batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator:
+    """Yield rows from a server-side cursor, batch_size rows per fetch"""
+    query = export_query(dataset, start, end, after, limit).execution_options(yield_per=batch_size)
+    async with AsyncSession() as session:
+        result = await session.stream(query)
+        async for row in result:
+            yield row
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def stream_export(dataset: str, export_format: str, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None, after: Optional[Sequence] = None,
+                        limit: Optional[int] = None) -> AsyncIterator[str]:
+    """Encode an export as NDJSON or CSV text chunks
+
+    When a limited page comes back full, NDJSON ends with a
+    {"next_cursor": ...} line; CSV callers build the cursor from the last
+    row's sort key columns.
+    """
+    names = [column.key for column in EXPORT_DATASETS[dataset]["columns"]]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow(names)
+
+    rows = 0
+    last_row = None
+    async for row in stream_export_rows(dataset, start, end, after, limit):
+        if writer:
+            writer.writerow(_json_value(value) for value in row)
+        else:
+            buffer.write(json.dumps({name: _json_value(value) for name, value in zip(names, row)}) + "\n")
+        rows += 1
+        last_row = row
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if not writer and limit and rows == limit:
+        buffer.write(json.dumps({"next_cursor": encode_export_cursor(dataset, last_row)}) + "\n")
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,312 @@
+"""
+Async Data Access
+asyncio counterparts of the database_utils functions the FastAPI endpoints
+use, so database round-trips don't block the event loop. Statements with any
+logic in them are built once in database_utils and shared. Uses SQLAlchemy's
+asyncio extension with aiosqlite (SQLite) or asyncpg (Postgres).
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database_models import (
+    DATABASE_URL, engine_options, enable_sqlite_pragmas,
+    User, Assessment, ChatInteraction, Hackathon, HackathonParticipant, DashboardMetrics, UserLoginLog, AssessmentSession
+)
+from database_utils import (
+    login_log_values, login_logs_with_users_query, dashboard_metrics_increments,
+    login_user_updates, new_login_user, login_user_query, assessment_session_upsert
+)
+from login_rollups import login_rollup_update, login_rollups_query
+from question_bank import (
+    insert_questions, record_served, sample_questions_query, unseen_count_query, as_assessment_question
+)
+
+# Async driver used for each database dialect
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg"
+}
+
+
+def async_database_url(database_url):
+    """Swap the sync driver in a database URL for its async counterpart"""
+    scheme, rest = database_url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    return f"{ASYNC_DRIVERS.get(dialect, scheme)}://{rest}"
+
+
+def create_async_db_engine(database_url):
+    """Async engine with the same pool settings and SQLite pragmas as the sync engine"""
+    async_engine = create_async_engine(async_database_url(database_url), **engine_options(database_url))
+    if database_url.startswith("sqlite"):
+        enable_sqlite_pragmas(async_engine.sync_engine, database_url)
+    return async_engine
+
+
+async_engine = create_async_db_engine(DATABASE_URL)
+
+AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def dispose_async_engine():
+    """Close pooled connections (shutdown hook)"""
+    await async_engine.dispose()
+
+
+# User management functions
+async def get_user(user_id):
+    """Get user by ID"""
+    async with AsyncSession() as session:
+        return await session.scalar(select(User).where(User.id == user_id))
+
+async def get_user_by_email(email):
+    """Get user by email"""
+    async with AsyncSession() as session:
+        return await session.scalar(select(User).where(User.email == email))
+
+async def get_all_users_with_login_data():
+    """Get all users with their login data"""
+    async with AsyncSession() as session:
+        return (await session.scalars(select(User).order_by(User.last_login.desc()))).all()
+
+async def add_to_login_rollups(session, login_logs):
+    """Count new login logs (login_log_values dicts) into the analytics rollups, in the caller's transaction"""
+    rollup_update = login_rollup_update(session.bind.dialect.name, login_logs)
+    if rollup_update:
+        await session.execute(*rollup_update)
+
+async def record_user_login(login_data, save_log=True, _retry=True):
+    """Record a login in one session and one transaction (see database_utils.record_user_login)"""
+    async with AsyncSession() as session:
+        try:
+            now = datetime.utcnow()
+            reactivate, touch = login_user_updates(login_data["email"], now)
+
+            # Returning user who had gone inactive: also counts as active again
+            reactivated = (await session.execute(reactivate)).rowcount
+            existing = reactivated or (await session.execute(touch)).rowcount
+
+            if existing:
+                if reactivated:
+                    await bump_dashboard_metrics(session, active_users=1)
+            else:
+                session.add(new_login_user(login_data, now))
+                await bump_dashboard_metrics(session, total_users=1, active_users=1)
+
+            user = (await session.execute(login_user_query(login_data["email"]))).one()
+
+            if save_log:
+                values = login_log_values(login_data, user_id=user.id)
+                session.add(UserLoginLog(**values))
+                await add_to_login_rollups(session, [values])
+            await session.commit()
+            return dict(user._mapping)
+        except IntegrityError:
+            # Lost a race creating the same new user; the retry takes the update path
+            await session.rollback()
+            if not _retry:
+                raise
+    return await record_user_login(login_data, save_log=save_log, _retry=False)
+
+async def get_user_login_logs(user_id=None, limit=100):
+    """Get user login logs with optional user filter"""
+    async with AsyncSession() as session:
+        query = select(UserLoginLog)
+        if user_id:
+            query = query.where(UserLoginLog.user_id == user_id)
+        query = query.order_by(UserLoginLog.login_timestamp.desc()).limit(limit)
+        return (await session.scalars(query)).all()
+
+async def get_login_logs_with_users(limit=100, after=None, user_id=None):
+    """Get login logs joined with their user's email and name (keyset paginated)"""
+    async with AsyncSession() as session:
+        return (await session.execute(login_logs_with_users_query(limit, after, user_id))).all()
+
+async def get_recent_login_activity(days=30):
+    """Get recent login activity for analytics"""
+    async with AsyncSession() as session:
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        return (await session.scalars(
+            select(UserLoginLog)
+            .where(UserLoginLog.login_timestamp >= cutoff_date)
+            .order_by(UserLoginLog.login_timestamp.desc())
+        )).all()
+
+async def get_login_rollups(granularity, dimension, start, end=None):
+    """Pre-aggregated login counts for one granularity and dimension"""
+    async with AsyncSession() as session:
+        return (await session.execute(login_rollups_query(granularity, dimension, start, end))).all()
+
+# Assessment functions
+async def save_assessment(assessment_data):
+    """Save assessment results"""
+    async with AsyncSession() as session:
+        assessment = Assessment(
+            id=assessment_data["assessment_id"],
+            user_id=assessment_data["user_id"],
+            title=assessment_data["title"],
+            skills=assessment_data["skills"],
+            difficulty=assessment_data["difficulty"],
+            score=assessment_data["score"],
+            status="completed",
+            created_at=datetime.utcnow(),
+            completed_at=datetime.utcnow()
+        )
+        session.add(assessment)
+        if assessment_data["score"] is not None:
+            await bump_dashboard_metrics(session, completed_score=assessment_data["score"])
+        await session.commit()
+        return assessment
+
+async def get_user_assessments(user_id):
+    """Get all assessments for a user"""
+    async with AsyncSession() as session:
+        return (await session.scalars(select(Assessment).where(Assessment.user_id == user_id))).all()
+
+# Assessment session functions
+async def save_assessment_session(assessment_data, ttl_seconds):
+    """Store a generated assessment until it is submitted or expires"""
+    async with AsyncSession() as session:
+        await session.execute(assessment_session_upsert(session.bind.dialect.name, assessment_data, ttl_seconds))
+        await session.commit()
+
+async def get_assessment_session(assessment_id):
+    """Get a stored assessment by ID, or None if missing or expired"""
+    async with AsyncSession() as session:
+        record = await session.get(AssessmentSession, assessment_id)
+        if record and record.expires_at > datetime.utcnow():
+            return record.payload
+        return None
+
+async def get_assessment_sessions(assessment_ids):
+    """Get many stored assessments in one query, keyed by ID"""
+    async with AsyncSession() as session:
+        records = await session.scalars(select(AssessmentSession).where(
+            AssessmentSession.id.in_(assessment_ids),
+            AssessmentSession.expires_at > datetime.utcnow()
+        ))
+        return {record.id: record.payload for record in records}
+
+# Question bank functions
+async def add_bank_questions(rows):
+    """Insert question_rows() dicts, skipping ones already banked; returns how many were new"""
+    if not rows:
+        return 0
+    async with AsyncSession() as session:
+        # Core-level execute, so rowcount reports the rows actually inserted
+        connection = await session.connection()
+        result = await connection.execute(insert_questions(connection.dialect.name), rows)
+        await session.commit()
+        return result.rowcount
+
+async def sample_bank_questions(skill, difficulty, count, user_id=None):
+    """Up to count random bank questions the user hasn't seen, and how many unseen remain after them"""
+    async with AsyncSession() as session:
+        sampled = (await session.scalars(sample_questions_query(skill, difficulty, count, user_id))).all()
+        remaining = await session.scalar(unseen_count_query(skill, difficulty, user_id)) - len(sampled)
+        return [as_assessment_question(question) for question in sampled], remaining
+
+async def record_served_questions(user_id, question_ids):
+    """Remember which bank questions a user was given so they aren't repeated"""
+    if not user_id or not question_ids:
+        return
+    async with AsyncSession() as session:
+        now = datetime.utcnow()
+        await session.execute(record_served(session.bind.dialect.name), [
+            {"user_id": user_id, "question_id": question_id, "served_at": now} for question_id in question_ids
+        ])
+        await session.commit()
+
+# Chat interaction functions
+async def save_chat_interaction(user_id, message, response):
+    """Save chat interaction"""
+    async with AsyncSession() as session:
+        interaction = ChatInteraction(
+            user_id=user_id,
+            message=message,
+            response=response,
+            timestamp=datetime.utcnow()
+        )
+        session.add(interaction)
+        await session.commit()
+        return interaction
+
+async def get_chat_interactions(user_id=None, start_date=None, end_date=None):
+    """Get chat interactions with optional filters"""
+    async with AsyncSession() as session:
+        query = select(ChatInteraction)
+        if user_id:
+            query = query.where(ChatInteraction.user_id == user_id)
+        if start_date:
+            query = query.where(ChatInteraction.timestamp >= start_date)
+        if end_date:
+            query = query.where(ChatInteraction.timestamp <= end_date)
+        return (await session.scalars(query.order_by(ChatInteraction.timestamp.desc()))).all()
+
+# Hackathon functions
+async def create_hackathon(hackathon_data):
+    """Create a new hackathon"""
+    async with AsyncSession() as session:
+        hackathon = Hackathon(
+            title=hackathon_data["title"],
+            description=hackathon_data["description"],
+            start_date=hackathon_data["start_date"],
+            end_date=hackathon_data["end_date"],
+            status=hackathon_data["status"],
+            skill_level=hackathon_data["skill_level"],
+            technologies=hackathon_data["technologies"],
+            created_at=datetime.utcnow()
+        )
+        session.add(hackathon)
+        await session.commit()
+        return hackathon
+
+async def get_hackathons(status=None):
+    """Get all hackathons with optional status filter"""
+    async with AsyncSession() as session:
+        query = select(Hackathon)
+        if status:
+            query = query.where(Hackathon.status == status)
+        return (await session.scalars(query)).all()
+
+async def join_hackathon(user_id, hackathon_id):
+    """Add user as participant to hackathon"""
+    existing_query = select(HackathonParticipant).where(
+        HackathonParticipant.user_id == user_id,
+        HackathonParticipant.hackathon_id == hackathon_id
+    )
+    async with AsyncSession() as session:
+        existing = await session.scalar(existing_query)
+        if existing:
+            return existing
+
+        participant = HackathonParticipant(
+            user_id=user_id,
+            hackathon_id=hackathon_id,
+            joined_at=datetime.utcnow()
+        )
+        session.add(participant)
+        try:
+            await session.commit()
+            return participant
+        except IntegrityError:
+            # A concurrent request joined first; the unique index kept one row
+            await session.rollback()
+            return await session.scalar(existing_query)
+
+# Dashboard metrics functions
+async def bump_dashboard_metrics(session, total_users=0, active_users=0, completed_score=None):
+    """Incrementally adjust dashboard metrics inside the caller's transaction"""
+    values = dashboard_metrics_increments(total_users, active_users, completed_score)
+    if values:
+        await session.execute(update(DashboardMetrics).values(values).execution_options(synchronize_session=False))
+
+async def get_dashboard_metrics():
+    """Get current dashboard metrics"""
+    async with AsyncSession() as session:
+        return await session.scalar(select(DashboardMetrics).limit(1))
@@ -0,0 +1,97 @@
+"""
+Database Migrations
+Lightweight, ordered schema migrations. init_db's create_all only creates
+missing tables, so indexes, constraints and columns added to existing tables
+are applied here and recorded in schema_migrations.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+from sqlalchemy.exc import IntegrityError
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow)
+)
+
+# (version, description, function(connection)) in the order they were added
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Register a migration; each one runs once, inside its own transaction"""
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        return func
+    return register
+
+
+def create_model_indexes(connection, *models):
+    """Create any of the models' declared indexes that don't exist yet"""
+    for model in models:
+        for index in model.__table__.indexes:
+            index.create(connection, checkfirst=True)
+
+
+@migration(1, "Indexes for hot query columns and unique hackathon participants")
+def add_hot_path_indexes(connection):
+    from database_models import (
+        User, Assessment, AssessmentSession, ChatInteraction, Hackathon, HackathonParticipant, UserLoginLog
+    )
+
+    # Keep the earliest row of any duplicate (user, hackathon) pair before the unique index
+    connection.execute(text(
+        "DELETE FROM hackathon_participants WHERE id NOT IN "
+        "(SELECT MIN(id) FROM hackathon_participants GROUP BY user_id, hackathon_id)"
+    ))
+    create_model_indexes(
+        connection, User, Assessment, AssessmentSession, ChatInteraction, Hackathon, HackathonParticipant, UserLoginLog
+    )
+
+
+@migration(2, "Backfill login analytics rollups")
+def backfill_login_rollups(connection):
+    from database_models import LoginRollup
+    from login_rollups import apply_rollup_adjustments, login_rollup_adjustments
+
+    LoginRollup.__table__.create(connection, checkfirst=True)
+    apply_rollup_adjustments(connection, login_rollup_adjustments(connection))
+
+
+@migration(3, "Question bank seeded with the predefined questions")
+def seed_question_bank(connection):
+    from database_models import BankQuestion, UserQuestionHistory
+    from question_bank import insert_questions, seed_question_rows
+
+    BankQuestion.__table__.create(connection, checkfirst=True)
+    UserQuestionHistory.__table__.create(connection, checkfirst=True)
+    connection.execute(insert_questions(connection.dialect.name), seed_question_rows())
+
+
+def run_migrations(engine):
+    """Apply pending migrations in version order"""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+    for version, description, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as connection:
+                func(connection)
+                connection.execute(schema_migrations.insert().values(
+                    version=version,
+                    description=description,
+                    applied_at=datetime.utcnow()
+                ))
+            print(f"✅ Applied database migration {version}: {description}")
+        except IntegrityError:
+            # Another worker applied the same migration first
+            print(f"ℹ️ Database migration {version} already applied by another process")
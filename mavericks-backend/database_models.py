@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, create_engine
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, Index, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
@@ -11,8 +11,63 @@ load_dotenv()
 # Get database URL from environment or use SQLite as fallback
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mavericks_platform.db")
 
+# Connection pool settings (server databases such as Postgres)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# SQLite performance mode, applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def engine_options(database_url):
+    """Pool settings for server databases, busy timeout for SQLite"""
+    if database_url.startswith("sqlite"):
+        return {"connect_args": {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING
+    }
+
+
+def enable_sqlite_pragmas(sqlite_engine, database_url):
+    """Apply the SQLite performance pragmas to every new connection of a (sync) engine"""
+    in_memory = ":memory:" in database_url or database_url.rstrip("/").endswith(":")
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers proceed while a writer commits; NORMAL only syncs at checkpoints
+        if not in_memory:
+            cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
+def create_db_engine(database_url):
+    """Create the engine with pooling for server databases and pragmas for SQLite"""
+    db_engine = create_engine(database_url, **engine_options(database_url))
+    if database_url.startswith("sqlite"):
+        enable_sqlite_pragmas(db_engine, database_url)
+    return db_engine
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine(DATABASE_URL)
+
+# Shared session factory. Objects keep their loaded values after commit so
+# they can be returned once the session is closed.
+Session = sessionmaker(bind=engine, expire_on_commit=False)
 
 # Create base class for declarative models
 Base = declarative_base()
@@ -20,6 +75,9 @@ Base = declarative_base()
 # Define User model
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_last_login", "last_login"),
+    )
     
     id = Column(String, primary_key=True)  # UID from Firebase or other auth provider
     email = Column(String, unique=True, nullable=False)
@@ -41,6 +99,10 @@ class User(Base):
 # Define Assessment model
 class Assessment(Base):
     __tablename__ = "assessments"
+    __table_args__ = (
+        Index("ix_assessments_user_id", "user_id"),
+        Index("ix_assessments_status_score", "status", "score"),
+    )
     
     id = Column(String, primary_key=True)  # Generated assessment ID
     user_id = Column(String, ForeignKey("users.id"))
@@ -61,6 +123,10 @@ class Assessment(Base):
 # Define ChatInteraction model
 class ChatInteraction(Base):
     __tablename__ = "chat_interactions"
+    __table_args__ = (
+        Index("ix_chat_interactions_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_chat_interactions_timestamp", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("users.id"))
@@ -77,6 +143,9 @@ class ChatInteraction(Base):
 # Define Hackathon model
 class Hackathon(Base):
     __tablename__ = "hackathons"
+    __table_args__ = (
+        Index("ix_hackathons_status", "status"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String, nullable=False)
@@ -97,6 +166,12 @@ class Hackathon(Base):
 # Define HackathonParticipant model (many-to-many relationship)
 class HackathonParticipant(Base):
     __tablename__ = "hackathon_participants"
+    __table_args__ = (
+        # A user joins a hackathon at most once; a unique index (rather than a
+        # table constraint) so migrations can add it to existing SQLite tables
+        Index("uq_hackathon_participants_user_hackathon", "user_id", "hackathon_id", unique=True),
+        Index("ix_hackathon_participants_hackathon_id", "hackathon_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("users.id"))
@@ -113,6 +188,10 @@ class HackathonParticipant(Base):
 # Define UserLoginLog model for detailed login tracking
 class UserLoginLog(Base):
     __tablename__ = "user_login_logs"
+    __table_args__ = (
+        Index("ix_user_login_logs_user_id_login_timestamp", "user_id", "login_timestamp"),
+        Index("ix_user_login_logs_login_timestamp_id", "login_timestamp", "id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("users.id"))
@@ -134,6 +213,73 @@ class UserLoginLog(Base):
     def __repr__(self):
         return f"<UserLoginLog {self.user_id} at {self.login_timestamp}>"
 
+# Define AssessmentSession model for generated assessments awaiting submission
+class AssessmentSession(Base):
+    __tablename__ = "assessment_sessions"
+    
+    id = Column(String, primary_key=True)  # assessment_id handed to the client
+    payload = Column(JSON, nullable=False)  # Full generated assessment, including answers
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<AssessmentSession {self.id}>"
+
+# Define LoginRollup model for pre-aggregated login analytics
+class LoginRollup(Base):
+    __tablename__ = "login_rollups"
+    __table_args__ = (
+        Index("uq_login_rollups_bucket", "granularity", "dimension", "bucket_start", "value", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    granularity = Column(String, nullable=False)  # hour, day
+    dimension = Column(String, nullable=False)  # all, browser, operating_system, platform, timezone, language
+    value = Column(String, nullable=False)  # dimension value, "unknown" when not reported
+    bucket_start = Column(DateTime, nullable=False)  # UTC start of the hour or day
+    login_count = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<LoginRollup {self.granularity} {self.dimension}={self.value} {self.bucket_start}>"
+
+# Define BankQuestion model for the reusable question bank
+class BankQuestion(Base):
+    __tablename__ = "question_bank"
+    __table_args__ = (
+        Index("ix_question_bank_skill_key_difficulty", "skill_key", "difficulty"),
+        Index("uq_question_bank_content_hash", "content_hash", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    skill_key = Column(String, nullable=False)  # skill_registry.cache_key(skill)
+    skill = Column(String, nullable=False)  # canonical skill name shown to users
+    difficulty = Column(String, nullable=False)  # beginner, intermediate, advanced
+    question = Column(Text, nullable=False)
+    options = Column(JSON, nullable=False)
+    correct_answer = Column(Text, nullable=False)
+    explanation = Column(Text)
+    source = Column(String, nullable=False)  # predefined, llm, import
+    content_hash = Column(String(64), nullable=False)  # same question from any source is stored once
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<BankQuestion {self.skill} ({self.difficulty}) {self.id}>"
+
+# Define UserQuestionHistory model so users aren't served the same bank question twice
+class UserQuestionHistory(Base):
+    __tablename__ = "user_question_history"
+    __table_args__ = (
+        Index("uq_user_question_history_user_question", "user_id", "question_id", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False)
+    question_id = Column(Integer, ForeignKey("question_bank.id"), nullable=False)
+    served_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<UserQuestionHistory {self.user_id} {self.question_id}>"
+
 # Define DashboardMetrics model for caching dashboard statistics
 class DashboardMetrics(Base):
     __tablename__ = "dashboard_metrics"
@@ -152,8 +298,10 @@ class DashboardMetrics(Base):
 def init_db():
     Base.metadata.create_all(engine)
     
-    # Create a session
-    Session = sessionmaker(bind=engine)
+    # Bring existing databases up to date (indexes, constraints, columns)
+    from database_migrations import run_migrations
+    run_migrations(engine)
+    
     session = Session()
     
     # Initialize dashboard metrics if not exists
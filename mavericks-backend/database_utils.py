@@ -1,10 +1,11 @@
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
-from database_models import engine, User, Assessment, ChatInteraction, Hackathon, HackathonParticipant, DashboardMetrics, UserLoginLog
+from database_models import Session, User, Assessment, ChatInteraction, Hackathon, HackathonParticipant, DashboardMetrics, UserLoginLog, AssessmentSession
+from login_rollups import login_rollup_update, utc_naive
 
-# Create session factory
-Session = sessionmaker(bind=engine)
+# Users who logged in within this many days count as active
+ACTIVE_USER_DAYS = 30
 
 # User management functions
 def get_user(user_id):
@@ -48,6 +49,7 @@ def create_user(user_data):
             login_count=1
         )
         session.add(user)
+        bump_dashboard_metrics(session, total_users=1, active_users=1)
         session.commit()
         return user
     finally:
@@ -59,6 +61,9 @@ def update_user_login(user_id):
     try:
         user = session.query(User).filter(User.id == user_id).first()
         if user:
+            # A returning user who was inactive becomes active again
+            if not user.last_login or user.last_login < datetime.utcnow() - timedelta(days=ACTIVE_USER_DAYS):
+                bump_dashboard_metrics(session, active_users=1)
             user.last_login = datetime.utcnow()
             user.login_count += 1
             session.commit()
@@ -67,28 +72,40 @@ def update_user_login(user_id):
     finally:
         session.close()
 
+def login_log_values(login_data, user_id=None):
+    """Column values for a UserLoginLog row from login request data"""
+    device_info = login_data.get('deviceInfo') or {}
+    
+    return dict(
+        user_id=user_id or login_data['uid'],
+        session_id=login_data.get('sessionId'),
+        login_timestamp=utc_naive(datetime.fromisoformat(login_data['loginTimestamp'].replace('Z', '+00:00'))),
+        ip_address=login_data.get('ipAddress'),
+        browser=device_info.get('browser'),
+        operating_system=device_info.get('os'),
+        platform=device_info.get('platform'),
+        language=device_info.get('language'),
+        screen_resolution=device_info.get('screen'),
+        timezone=device_info.get('timezone'),
+        user_agent=device_info.get('userAgent'),
+        device_info=device_info
+    )
+
+def add_to_login_rollups(session, login_logs):
+    """Count new login logs (login_log_values dicts) into the analytics rollups, in the caller's transaction"""
+    rollup_update = login_rollup_update(session.get_bind().dialect.name, login_logs)
+    if rollup_update:
+        session.execute(*rollup_update)
+
 def save_login_log(login_data):
     """Save detailed login tracking data"""
     session = Session()
     try:
-        device_info = login_data.get('deviceInfo', {})
-        
-        login_log = UserLoginLog(
-            user_id=login_data['uid'],
-            session_id=login_data.get('sessionId'),
-            login_timestamp=datetime.fromisoformat(login_data['loginTimestamp'].replace('Z', '+00:00')),
-            ip_address=login_data.get('ipAddress'),
-            browser=device_info.get('browser'),
-            operating_system=device_info.get('os'),
-            platform=device_info.get('platform'),
-            language=device_info.get('language'),
-            screen_resolution=device_info.get('screen'),
-            timezone=device_info.get('timezone'),
-            user_agent=device_info.get('userAgent'),
-            device_info=device_info
-        )
+        values = login_log_values(login_data)
+        login_log = UserLoginLog(**values)
         
         session.add(login_log)
+        add_to_login_rollups(session, [values])
         session.commit()
         return login_log
     except Exception as e:
@@ -98,6 +115,107 @@ def save_login_log(login_data):
     finally:
         session.close()
 
+def save_login_logs_bulk(login_events):
+    """Insert many login logs with one executemany and one commit
+    
+    If the batch fails, the rows are inserted one by one so a single bad
+    event only loses itself. Returns the number of logs written.
+    """
+    if not login_events:
+        return 0
+    session = Session()
+    try:
+        values = [login_log_values(event) for event in login_events]
+        session.execute(insert(UserLoginLog), values)
+        add_to_login_rollups(session, values)
+        session.commit()
+        return len(login_events)
+    except Exception as e:
+        session.rollback()
+        if len(login_events) == 1:
+            raise
+        print(f"⚠️ Bulk login log insert failed ({e}), inserting {len(login_events)} logs one by one")
+    finally:
+        session.close()
+    return sum(1 for event in login_events if save_login_log(event) is not None)
+
+def login_user_updates(email, now):
+    """(reactivate, touch) UPDATEs that record a login for an existing user
+    
+    Both set last_login and bump login_count atomically; reactivate only
+    matches a user who had gone inactive, so its rowcount tells whether the
+    login makes them active again. Shared with the async data-access layer.
+    """
+    login_update = {User.last_login: now, User.login_count: User.login_count + 1}
+    inactive_cutoff = now - timedelta(days=ACTIVE_USER_DAYS)
+    reactivate = update(User).where(
+        User.email == email,
+        or_(User.last_login.is_(None), User.last_login < inactive_cutoff)
+    ).values(login_update).execution_options(synchronize_session=False)
+    touch = update(User).where(User.email == email).values(login_update).execution_options(synchronize_session=False)
+    return reactivate, touch
+
+def new_login_user(login_data, now):
+    """User row for a first login"""
+    return User(
+        id=login_data["uid"],
+        email=login_data["email"],
+        display_name=login_data.get("displayName"),
+        role=login_data.get("role", "user"),
+        created_at=now,
+        last_login=now,
+        login_count=1
+    )
+
+def login_user_query(email):
+    """The fields record_user_login returns"""
+    return select(
+        User.id, User.email, User.display_name, User.role, User.login_count, User.last_login
+    ).where(User.email == email)
+
+def record_user_login(login_data, save_log=True, _retry=True):
+    """Record a login in one session and one transaction
+    
+    Upserts the user with an atomic login_count = login_count + 1, inserts the
+    login log (unless save_log is False, e.g. when it is buffered) and bumps the
+    dashboard metrics, then commits once. Returns the user's fields as a dict.
+    """
+    session = Session()
+    try:
+        now = datetime.utcnow()
+        reactivate, touch = login_user_updates(login_data["email"], now)
+        
+        # Returning user who had gone inactive: also counts as active again
+        reactivated = session.execute(reactivate).rowcount
+        existing = reactivated or session.execute(touch).rowcount
+        
+        if existing:
+            if reactivated:
+                bump_dashboard_metrics(session, active_users=1)
+        else:
+            session.add(new_login_user(login_data, now))
+            bump_dashboard_metrics(session, total_users=1, active_users=1)
+        
+        user = session.execute(login_user_query(login_data["email"])).one()
+        
+        if save_log:
+            values = login_log_values(login_data, user_id=user.id)
+            session.add(UserLoginLog(**values))
+            add_to_login_rollups(session, [values])
+        session.commit()
+        return dict(user._mapping)
+    except IntegrityError:
+        # Lost a race creating the same new user; the retry takes the update path
+        session.rollback()
+        if _retry:
+            return record_user_login(login_data, save_log=save_log, _retry=False)
+        raise
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 def get_user_login_logs(user_id=None, limit=100):
     """Get user login logs with optional user filter"""
     session = Session()
@@ -111,6 +229,52 @@ def get_user_login_logs(user_id=None, limit=100):
     finally:
         session.close()
 
+def login_logs_with_users_query(limit=100, after=None, user_id=None):
+    """SELECT for get_login_logs_with_users (shared with the async data-access layer)"""
+    query = select(
+        UserLoginLog.id,
+        UserLoginLog.user_id,
+        User.email.label("user_email"),
+        User.display_name.label("user_display_name"),
+        UserLoginLog.session_id,
+        UserLoginLog.login_timestamp,
+        UserLoginLog.ip_address,
+        UserLoginLog.browser,
+        UserLoginLog.operating_system,
+        UserLoginLog.platform,
+        UserLoginLog.language,
+        UserLoginLog.screen_resolution,
+        UserLoginLog.timezone
+    ).outerjoin(UserLoginLog.user)
+    
+    if user_id:
+        query = query.where(UserLoginLog.user_id == user_id)
+    
+    if after:
+        after_timestamp, after_id = after
+        query = query.where(or_(
+            UserLoginLog.login_timestamp < after_timestamp,
+            and_(UserLoginLog.login_timestamp == after_timestamp, UserLoginLog.id < after_id)
+        ))
+    
+    return query.order_by(
+        UserLoginLog.login_timestamp.desc(),
+        UserLoginLog.id.desc()
+    ).limit(limit)
+
+def get_login_logs_with_users(limit=100, after=None, user_id=None):
+    """Get login logs joined with their user's email and name in a single query
+    
+    Rows are ordered newest first by (login_timestamp, id). Pass the last row's
+    (login_timestamp, id) as `after` to fetch the next page (keyset pagination).
+    Only the columns the admin login-log view needs are selected.
+    """
+    session = Session()
+    try:
+        return session.execute(login_logs_with_users_query(limit, after, user_id)).all()
+    finally:
+        session.close()
+
 def get_recent_login_activity(days=30):
     """Get recent login activity for analytics"""
     session = Session()
@@ -140,6 +304,8 @@ def save_assessment(assessment_data):
             completed_at=datetime.utcnow()
         )
         session.add(assessment)
+        if assessment_data["score"] is not None:
+            bump_dashboard_metrics(session, completed_score=assessment_data["score"])
         session.commit()
         return assessment
     finally:
@@ -154,6 +320,76 @@ def get_user_assessments(user_id):
     finally:
         session.close()
 
+# Assessment session functions
+def assessment_session_upsert(dialect_name, assessment_data, ttl_seconds):
+    """INSERT ... ON CONFLICT that stores or replaces a generated assessment (SQLite and Postgres)
+    
+    Shared with the async data-access layer.
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    now = datetime.utcnow()
+    statement = dialect_insert(AssessmentSession).values(
+        id=assessment_data["assessment_id"],
+        payload=assessment_data,
+        created_at=now,
+        expires_at=now + timedelta(seconds=ttl_seconds)
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[AssessmentSession.id],
+        set_={
+            "payload": statement.excluded.payload,
+            "created_at": statement.excluded.created_at,
+            "expires_at": statement.excluded.expires_at
+        }
+    )
+
+def save_assessment_session(assessment_data, ttl_seconds):
+    """Store a generated assessment until it is submitted or expires"""
+    session = Session()
+    try:
+        session.execute(assessment_session_upsert(session.get_bind().dialect.name, assessment_data, ttl_seconds))
+        session.commit()
+    finally:
+        session.close()
+
+def get_assessment_session(assessment_id):
+    """Get a stored assessment by ID, or None if missing or expired"""
+    session = Session()
+    try:
+        record = session.get(AssessmentSession, assessment_id)
+        if record and record.expires_at > datetime.utcnow():
+            return record.payload
+        return None
+    finally:
+        session.close()
+
+def get_assessment_sessions(assessment_ids):
+    """Get many stored assessments in one query, keyed by ID"""
+    session = Session()
+    try:
+        records = session.query(AssessmentSession).filter(
+            AssessmentSession.id.in_(assessment_ids),
+            AssessmentSession.expires_at > datetime.utcnow()
+        ).all()
+        return {record.id: record.payload for record in records}
+    finally:
+        session.close()
+
+def delete_expired_assessment_sessions():
+    """Remove expired assessment sessions and return how many were deleted"""
+    session = Session()
+    try:
+        deleted = session.query(AssessmentSession).filter(
+            AssessmentSession.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+        session.commit()
+        return deleted
+    finally:
+        session.close()
+
 # Chat interaction functions
 def save_chat_interaction(user_id, message, response):
     """Save chat interaction"""
@@ -250,12 +486,46 @@ def join_hackathon(user_id, hackathon_id):
         session.add(participant)
         session.commit()
         return participant
+    except IntegrityError:
+        # A concurrent request joined first; the unique index kept one row
+        session.rollback()
+        return session.query(HackathonParticipant).filter(
+            HackathonParticipant.user_id == user_id,
+            HackathonParticipant.hackathon_id == hackathon_id
+        ).first()
     finally:
         session.close()
 
 # Dashboard metrics functions
+def dashboard_metrics_increments(total_users=0, active_users=0, completed_score=None):
+    """Column updates for bump_dashboard_metrics (shared with the async data-access layer)"""
+    values = {}
+    if total_users:
+        values[DashboardMetrics.total_users] = func.coalesce(DashboardMetrics.total_users, 0) + total_users
+    if active_users:
+        values[DashboardMetrics.active_users] = func.coalesce(DashboardMetrics.active_users, 0) + active_users
+    if completed_score is not None:
+        completed = func.coalesce(DashboardMetrics.assessments_completed, 0)
+        average = func.coalesce(DashboardMetrics.average_score, 0.0)
+        # Running mean; both expressions read the pre-update column values
+        values[DashboardMetrics.average_score] = (average * completed + completed_score) / (completed + 1)
+        values[DashboardMetrics.assessments_completed] = completed + 1
+    if values:
+        values[DashboardMetrics.last_updated] = datetime.utcnow()
+    return values
+
+def bump_dashboard_metrics(session, total_users=0, active_users=0, completed_score=None):
+    """Incrementally adjust dashboard metrics inside the caller's transaction
+    
+    Uses atomic column arithmetic so concurrent writers never lose updates.
+    completed_score records one more completed assessment with that score.
+    """
+    values = dashboard_metrics_increments(total_users, active_users, completed_score)
+    if values:
+        session.execute(update(DashboardMetrics).values(values).execution_options(synchronize_session=False))
+
 def update_dashboard_metrics():
-    """Update dashboard metrics based on current data"""
+    """Recompute dashboard metrics from the full tables (periodic reconcile)"""
     session = Session()
     try:
         # Get metrics record (should only be one)
@@ -268,7 +538,7 @@ def update_dashboard_metrics():
         metrics.total_users = session.query(func.count(User.id)).scalar()
         
         # Calculate active users (logged in within last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        thirty_days_ago = datetime.utcnow() - timedelta(days=ACTIVE_USER_DAYS)
         metrics.active_users = session.query(func.count(User.id)).filter(
             User.last_login >= thirty_days_ago
         ).scalar()
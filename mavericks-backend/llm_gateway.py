@@ -0,0 +1,162 @@
+"""
+Async LLM Gateway
+Non-blocking access to Cohere with a concurrency limit and per-call timeouts,
+for whole completions or streamed ones
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Optional
+
+# Maximum number of LLM calls in flight per worker
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Seconds before a single LLM call is abandoned
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+
+# Optional override of the Cohere API host (e.g. a local fake server for load tests)
+COHERE_BASE_URL = os.getenv("COHERE_BASE_URL")
+
+
+class LLMGateway:
+    """Awaitable wrapper around the Cohere client
+
+    Uses the native async client when one is provided, otherwise runs the
+    synchronous client in a bounded thread pool so the event loop never blocks.
+    """
+
+    def __init__(self, async_client=None, sync_client=None,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 timeout: float = LLM_TIMEOUT_SECONDS,
+                 http_client=None):
+        if async_client is None and sync_client is None:
+            raise ValueError("LLMGateway needs an async or a sync client")
+
+        self.async_client = async_client
+        self.sync_client = sync_client
+        # httpx client behind async_client, owned by the gateway and closed by aclose()
+        self.http_client = http_client
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor = None
+        if async_client is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._semaphore = None
+        self.in_flight = 0
+        self.total_calls = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_api_key(cls, api_key: str, **kwargs) -> "LLMGateway":
+        """Build a gateway backed by cohere.AsyncClient"""
+        import cohere
+        import httpx
+
+        client_kwargs = {"base_url": COHERE_BASE_URL} if COHERE_BASE_URL else {}
+        http_client = httpx.AsyncClient()
+        return cls(
+            async_client=cohere.AsyncClient(api_key, httpx_client=http_client, **client_kwargs),
+            http_client=http_client,
+            **kwargs
+        )
+
+    async def aclose(self):
+        """Close pooled HTTP connections and worker threads (shutdown hook)"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def generate(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                       model: str = "command", timeout: Optional[float] = None) -> str:
+        """Generate a completion and return its text
+
+        Raises asyncio.TimeoutError when the call exceeds the timeout.
+        """
+        async with self._get_semaphore():
+            self.in_flight += 1
+            self.total_calls += 1
+            try:
+                if self.async_client is not None:
+                    call = self.async_client.generate(
+                        model=model,
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                else:
+                    loop = asyncio.get_running_loop()
+                    call = loop.run_in_executor(self._executor, partial(
+                        self.sync_client.generate,
+                        model=model,
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    ))
+                response = await asyncio.wait_for(call, timeout or self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+        return response.generations[0].text
+
+    async def generate_stream(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                              model: str = "command", timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Yield the completion's text as the provider streams it
+
+        The timeout covers the whole stream and the call holds its concurrency
+        slot until the stream ends or the caller stops iterating. Without a
+        streaming client the full completion is yielded as one chunk.
+        """
+        if self.async_client is None or not hasattr(self.async_client, "generate_stream"):
+            yield await self.generate(prompt, max_tokens, temperature, model, timeout)
+            return
+
+        async with self._get_semaphore():
+            self.in_flight += 1
+            self.total_calls += 1
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + (timeout or self.timeout)
+            events = self.async_client.generate_stream(
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ).__aiter__()
+            try:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(events.__anext__(), deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        self.timeouts += 1
+                        raise
+                    event_type = getattr(event, "event_type", None)
+                    if event_type == "text-generation" and event.text:
+                        yield event.text
+                    elif event_type == "stream-error":
+                        raise RuntimeError(f"LLM stream failed: {getattr(event, 'err', None) or event.finish_reason}")
+            finally:
+                self.in_flight -= 1
+                if hasattr(events, "aclose"):
+                    await events.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "in_flight": self.in_flight,
+            "total_calls": self.total_calls,
+            "timeouts": self.timeouts
+        }
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Load test for the async LLM gateway against a local fake Cohere server
+
+Compares blocking Cohere calls made from the event loop (the old code path)
+with the gateway, then drives /generate_assessment end to end.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_LATENCY_SECONDS = 0.5
+CONCURRENT_REQUESTS = 16
+
+FAKE_ASSESSMENT = {
+    "assessment_id": "fake",
+    "title": "Technical Skills Assessment",
+    "difficulty": "intermediate",
+    "skills_tested": ["Go", "Rust"],
+    "questions": [
+        {
+            "id": "q1",
+            "skill": "Go",
+            "question": "Which keyword starts a goroutine?",
+            "options": ["go", "async", "spawn", "thread"],
+            "correct_answer": "go",
+            "explanation": "The go keyword starts a goroutine"
+        }
+    ]
+}
+
+
+class FakeCohereHandler(BaseHTTPRequestHandler):
+    """Answers POST /v1/generate like Cohere, after a fixed delay
+
+    Streamed requests get the completion as NDJSON text-generation events
+    spread over the same delay.
+    """
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+        if request.get("stream"):
+            self.stream_generation()
+            return
+        time.sleep(FAKE_LATENCY_SECONDS)
+        body = json.dumps({
+            "id": "fake-generation",
+            "generations": [{"id": "fake-1", "text": json.dumps(FAKE_ASSESSMENT)}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_generation(self):
+        text = json.dumps(FAKE_ASSESSMENT)
+        chunks = [text[i:i + 20] for i in range(0, len(text), 20)]
+        self.send_response(200)
+        self.send_header("content-type", "application/stream+json")
+        self.end_headers()
+        for chunk in chunks:
+            time.sleep(FAKE_LATENCY_SECONDS / len(chunks))
+            event = {"event_type": "text-generation", "text": chunk, "is_finished": False}
+            self.wfile.write((json.dumps(event) + "\n").encode())
+            self.wfile.flush()
+        event = {"event_type": "stream-end", "is_finished": True, "finish_reason": "COMPLETE",
+                 "response": {"id": "fake-generation", "generations": []}}
+        self.wfile.write((json.dumps(event) + "\n").encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCohereHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def blocking_calls(client):
+    """The old path: sync client.generate called straight from async code"""
+    async def one_call():
+        client.generate(model="command", prompt="assessment", max_tokens=10, temperature=0.7)
+    await asyncio.gather(*(one_call() for _ in range(CONCURRENT_REQUESTS)))
+
+
+async def gateway_calls(gateway):
+    await asyncio.gather(*(gateway.generate("assessment", max_tokens=10) for _ in range(CONCURRENT_REQUESTS)))
+
+
+async def endpoint_calls(app):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(
+            client.post("/generate_assessment", json={"skills": ["Go", f"Skill{i}"]}, timeout=60)
+            for i in range(CONCURRENT_REQUESTS)
+        ))
+    return sum(1 for response in responses if response.status_code == 200)
+
+
+def report(label, elapsed):
+    print(f"   {label:<28} {elapsed:6.2f}s  ({CONCURRENT_REQUESTS / elapsed:5.1f} req/s)")
+
+
+def main():
+    server, base_url = start_fake_server()
+    os.environ["COHERE_API_KEY"] = "fake-key"
+    os.environ["COHERE_BASE_URL"] = base_url
+    # A file, not sqlite://: the sync and async engines would each get their own in-memory database
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load_test_llm_gateway.db')}")
+
+    import cohere
+    from llm_gateway import LLMGateway
+
+    print(f"🚀 LLM gateway load test: {CONCURRENT_REQUESTS} concurrent calls, {FAKE_LATENCY_SECONDS}s fake latency")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    asyncio.run(blocking_calls(cohere.Client("fake-key", base_url=base_url)))
+    report("Blocking sync client:", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    asyncio.run(gateway_calls(LLMGateway.from_api_key("fake-key")))
+    report("Async gateway:", time.perf_counter() - start)
+
+    import main as backend
+
+    start = time.perf_counter()
+    succeeded = asyncio.run(endpoint_calls(backend.app))
+    report(f"/generate_assessment ({succeeded} ok):", time.perf_counter() - start)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Login Event Buffer
+Queues login telemetry in-process and writes it to the database in batches
+from a background task, keeping log-table writes off the login response path
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+# Flush once this many events are queued...
+LOGIN_LOG_FLUSH_SIZE = int(os.getenv("LOGIN_LOG_FLUSH_SIZE", "200"))
+
+# ...or once the oldest queued event is this many milliseconds old
+LOGIN_LOG_FLUSH_MS = int(os.getenv("LOGIN_LOG_FLUSH_MS", "1000"))
+
+# Queue capacity; logins wait for space when the writer falls behind (backpressure)
+LOGIN_LOG_QUEUE_SIZE = int(os.getenv("LOGIN_LOG_QUEUE_SIZE", "10000"))
+
+# Queued by stop() so the flush task writes what it holds and exits
+_STOP = object()
+
+
+class LoginEventBuffer:
+    """Batches login events and hands each batch to a blocking bulk writer
+
+    writer(batch) returns how many of the events it wrote; the rest count as dropped.
+    """
+
+    def __init__(self, writer: Callable[[List[Dict]], int],
+                 flush_size: int = LOGIN_LOG_FLUSH_SIZE,
+                 flush_interval_ms: int = LOGIN_LOG_FLUSH_MS,
+                 max_queue: int = LOGIN_LOG_QUEUE_SIZE):
+        self.writer = writer
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.events_written = 0
+        self.events_dropped = 0
+        self.batches_written = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the flush task on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, event: Dict):
+        """Queue one login event, waiting for space if the queue is full"""
+        await self._queue.put(event)
+
+    async def _write(self, batch: List[Dict]):
+        try:
+            written = await asyncio.to_thread(self.writer, batch)
+            self.events_written += written
+            self.events_dropped += len(batch) - written
+            self.batches_written += 1
+        except Exception as e:
+            self.events_dropped += len(batch)
+            print(f"⚠️ Failed to write {len(batch)} login events: {e}")
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            event = await self._queue.get()
+            if event is _STOP:
+                break
+
+            # Collect until the batch is full or the first event is flush_interval old
+            batch = [event]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            await self._write(batch)
+
+    async def stop(self):
+        """Write everything still queued, then stop the flush task (shutdown hook)"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "events_written": self.events_written,
+            "events_dropped": self.events_dropped,
+            "batches_written": self.batches_written
+        }
@@ -0,0 +1,167 @@
+"""
+Login Rollups
+Hourly and daily login counts per browser, OS, platform, timezone and
+language, kept in login_rollups. Counts are bumped in the same transaction
+that inserts the login logs, and can be rebuilt from user_login_logs without
+blocking logins.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import delete, insert, select, text
+
+from database_models import LoginRollup, UserLoginLog
+
+ROLLUP_GRANULARITIES = ("hour", "day")
+
+# Dimension name -> login log column; "all" counts every login
+ROLLUP_DIMENSIONS = {
+    "all": None,
+    "browser": "browser",
+    "operating_system": "operating_system",
+    "platform": "platform",
+    "timezone": "timezone",
+    "language": "language"
+}
+
+UNKNOWN_VALUE = "unknown"
+
+# Rows written per INSERT when rebuilding
+ROLLUP_WRITE_BATCH = 1000
+
+
+def utc_naive(timestamp: datetime) -> datetime:
+    """Naive UTC, the form timestamps are stored in"""
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """UTC start of the hour or day containing timestamp"""
+    timestamp = utc_naive(timestamp)
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_counts(login_logs: Iterable[Mapping], counts: Optional[Counter] = None) -> Counter:
+    """Count logins per (granularity, dimension, bucket_start, value)
+
+    login_logs are mappings with login_timestamp and the dimension columns,
+    e.g. login_log_values() dicts or selected rows' _mapping.
+    """
+    counts = Counter() if counts is None else counts
+    for log in login_logs:
+        timestamp = log["login_timestamp"]
+        if timestamp is None:
+            continue
+        for granularity in ROLLUP_GRANULARITIES:
+            start = bucket_start(timestamp, granularity)
+            for dimension, column in ROLLUP_DIMENSIONS.items():
+                value = "" if column is None else (log.get(column) or UNKNOWN_VALUE)
+                counts[(granularity, dimension, start, str(value))] += 1
+    return counts
+
+
+def rollup_rows(counts: Counter) -> List[Dict]:
+    return [
+        {"granularity": granularity, "dimension": dimension, "bucket_start": start,
+         "value": value, "login_count": count}
+        for (granularity, dimension, start, value), count in counts.items()
+    ]
+
+
+def rollup_upsert(dialect_name: str):
+    """INSERT ... ON CONFLICT that adds to existing counts (SQLite and Postgres)"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    statement = dialect_insert(LoginRollup)
+    return statement.on_conflict_do_update(
+        index_elements=[LoginRollup.granularity, LoginRollup.dimension, LoginRollup.bucket_start, LoginRollup.value],
+        set_={"login_count": LoginRollup.login_count + statement.excluded.login_count}
+    )
+
+
+def login_rollup_update(dialect_name: str, login_logs: Iterable[Mapping]):
+    """(statement, params) that adds login_logs to the rollups, or None if there is nothing to add
+
+    Executed in the caller's transaction by both the sync and async data-access layers.
+    """
+    rows = rollup_rows(rollup_counts(login_logs))
+    if not rows:
+        return None
+    return rollup_upsert(dialect_name), rows
+
+
+def login_rollup_adjustments(connection, batch_size: int = 10000) -> Counter:
+    """Amounts to add to each rollup row so it matches user_login_logs
+
+    Reads the logs and the current rollups in the caller's transaction, which
+    must see one consistent snapshot of both.
+    """
+    columns = [UserLoginLog.login_timestamp] + [
+        getattr(UserLoginLog, column) for column in ROLLUP_DIMENSIONS.values() if column
+    ]
+    counts = Counter()
+    result = connection.execute(select(*columns).execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        rollup_counts((row._mapping for row in partition), counts)
+
+    rollups = select(LoginRollup.granularity, LoginRollup.dimension, LoginRollup.bucket_start,
+                     LoginRollup.value, LoginRollup.login_count)
+    for granularity, dimension, start, value, count in connection.execute(rollups):
+        counts[(granularity, dimension, start, value)] -= count
+    return Counter({key: delta for key, delta in counts.items() if delta})
+
+
+def apply_rollup_adjustments(connection, adjustments: Counter) -> int:
+    """Add adjustments to the rollups, drop rows left at zero and return the rows changed
+
+    Increments commute with the ones concurrent logins make, so this needs no
+    table lock.
+    """
+    rows = rollup_rows(adjustments)
+    upsert = rollup_upsert(connection.dialect.name)
+    for index in range(0, len(rows), ROLLUP_WRITE_BATCH):
+        connection.execute(upsert, rows[index:index + ROLLUP_WRITE_BATCH])
+    if rows:
+        connection.execute(delete(LoginRollup).where(LoginRollup.login_count <= 0))
+    return len(rows)
+
+
+def rebuild_login_rollups(engine, batch_size: int = 10000) -> int:
+    """Bring every rollup in line with user_login_logs and return the number of rows changed
+
+    The counts are computed from a read-only snapshot while logins carry on,
+    then applied in one short write transaction as the difference between
+    the snapshot's logs and the snapshot's rollups. Logins committed during
+    the rebuild keep their own increments, so none are lost or counted twice.
+    """
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection = connection.execution_options(isolation_level="REPEATABLE READ")
+        with connection.begin():
+            if connection.dialect.name == "sqlite":
+                # pysqlite doesn't open a transaction for SELECTs; without one each reads its own snapshot
+                connection.exec_driver_sql("BEGIN")
+            adjustments = login_rollup_adjustments(connection, batch_size)
+
+    with engine.begin() as connection:
+        return apply_rollup_adjustments(connection, adjustments)
+
+
+def login_rollups_query(granularity: str, dimension: str, start: datetime, end: Optional[datetime] = None):
+    """Rollup rows for one granularity and dimension in [start, end], oldest bucket first"""
+    query = select(LoginRollup.bucket_start, LoginRollup.value, LoginRollup.login_count).where(
+        LoginRollup.granularity == granularity,
+        LoginRollup.dimension == dimension,
+        LoginRollup.bucket_start >= bucket_start(start, granularity)
+    )
+    if end:
+        query = query.where(LoginRollup.bucket_start <= utc_naive(end))
+    return query.order_by(LoginRollup.bucket_start, LoginRollup.value)
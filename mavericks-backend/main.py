@@ -1,26 +1,44 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Body, Request
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Body, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
+import asyncio
+import hashlib
 import os
 from dotenv import load_dotenv
-import PyPDF2
-import io
 import json
-import re
+import random
 import uuid
 import time
 import shutil
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional, Tuple
 from pydantic import BaseModel
+from skill_matcher import skill_matcher
+from resume_parser import extract_resume_text, analyze_resume_in_pool, iter_zip_resumes, shutdown_parser_pool, ResumeBatchTooLarge, RESUME_MAX_BYTES, RESUME_BATCH_MAX_BYTES, RESUME_BATCH_MAX_FILES
+from cache_store import create_cache
+from assessment_grading import build_answer_key, get_answer_key, grade_submission, find_weak_skills, skill_score
+from llm_gateway import LLMGateway
+from question_stream import QuestionStreamParser
+from login_events import LoginEventBuffer
+from skill_registry import skill_registry
 
 # Try to import assessment_cache, but don't fail if it's not available
 try:
     from assessment_cache import (
-        get_cached_assessment, 
-        cache_assessment, 
+        get_or_generate_assessment,
+        get_cached_skill_questions,
+        cache_skill_questions,
+        assessment_flights,
         get_predefined_assessment,
-        get_video_recommendations
+        get_video_recommendations,
+        STARTER_QUESTIONS,
+        get_assessment_cache_stats,
+        assessment_cache,
+        ASSESSMENT_LEASE_SECONDS,
+        WORKER_ID
     )
+    from assessment_prewarm import AssessmentPrewarmer, assessment_demand
     assessment_cache_available = True
 except ImportError:
     print("⚠️ assessment_cache module not available - some features will be limited")
@@ -30,10 +48,13 @@ except ImportError:
 try:
     import cohere
     from database_models import engine, User, Assessment, ChatInteraction, Hackathon, HackathonParticipant, DashboardMetrics
-    from sqlalchemy.orm import sessionmaker
-    # Create session factory
-    Session = sessionmaker(bind=engine)
-    from database_utils import get_user, get_user_by_email, create_user, update_user_login, save_assessment, get_user_assessments, save_chat_interaction, get_chat_interactions, create_hackathon, get_hackathons, join_hackathon, update_dashboard_metrics, get_dashboard_metrics, get_all_users_with_login_data, save_login_log, get_user_login_logs, get_recent_login_activity
+    # Blocking helpers, only run from background threads
+    from database_utils import update_dashboard_metrics, save_login_logs_bulk, delete_expired_assessment_sessions
+    # Endpoints await the async data-access layer so DB round-trips don't block the event loop
+    from database_async import get_user, get_user_by_email, save_assessment, get_user_assessments, save_chat_interaction, get_chat_interactions, create_hackathon, get_hackathons, join_hackathon, get_dashboard_metrics, get_all_users_with_login_data, record_user_login, get_user_login_logs, get_login_logs_with_users, get_recent_login_activity, save_assessment_session, get_assessment_session, get_assessment_sessions, get_login_rollups, add_bank_questions, sample_bank_questions, record_served_questions, dispose_async_engine
+    from question_bank import question_rows, generated_question_rows, QUESTION_BANK_MIN_POOL, QUESTION_BANK_TOPUP_SIZE, DIFFICULTIES
+    from data_export import stream_export, decode_export_cursor, EXPORT_DATASETS, EXPORT_FORMATS
+    from login_rollups import rebuild_login_rollups, ROLLUP_GRANULARITIES, ROLLUP_DIMENSIONS
     database_available = True
 except ImportError:
     print("⚠️ Database modules not available - running in limited mode")
@@ -42,12 +63,12 @@ except ImportError:
 # Load .env
 load_dotenv()
 
-# Configure Cohere AI if available
-cohere_client = None
+# Configure Cohere AI if available (async gateway keeps the event loop free)
+llm_gateway = None
 cohere_key = os.getenv("COHERE_API_KEY")
 if database_available and cohere_key:
     try:
-        cohere_client = cohere.Client(cohere_key)
+        llm_gateway = LLMGateway.from_api_key(cohere_key)
         print("✅ Cohere AI configured successfully")
     except Exception as e:
         print(f"⚠️ Error configuring Cohere AI: {e}")
@@ -55,6 +76,9 @@ if database_available and cohere_key:
 else:
     print("⚠️ Cohere AI not available - assessment features will be limited")
 
+# Maximum number of per-skill assessments generated concurrently
+ASSESSMENT_FANOUT_CONCURRENCY = int(os.getenv("ASSESSMENT_FANOUT_CONCURRENCY", "5"))
+
 # Init FastAPI
 app = FastAPI(title="Resume Skill Extractor & Assessment System", version="2.0.0")
 
@@ -64,6 +88,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Initialize database if available
@@ -78,13 +103,12 @@ if database_available:
         database_available = False
 else:
     print("⚠️ Running without database functionality")
-    # Create in-memory storage for assessments
-    assessments_db = {}
 
 # Pydantic models for request/response
 class AssessmentRequest(BaseModel):
     skills: List[str]
     difficulty: str = "intermediate"  # beginner, intermediate, advanced
+    user_id: Optional[str] = None  # bank questions already served to this user are skipped
     
 class UserLoginRequest(BaseModel):
     uid: str
@@ -115,6 +139,14 @@ class AssessmentSubmission(BaseModel):
     assessment_id: str
     answers: Dict[str, str]
     time_taken: int  # in minutes
+    ai_improvement_plan: bool = False  # ask the LLM for a narrative improvement plan
+
+class QuestionImportRequest(BaseModel):
+    questions: List[Dict]  # skill, question, options, correct_answer, explanation, optional difficulty
+    difficulty: str = "intermediate"  # used for questions without their own
+
+class BulkGradeRequest(BaseModel):
+    submissions: List[AssessmentSubmission]
 
 class AssessmentResult(BaseModel):
     assessment_id: str
@@ -122,150 +154,264 @@ class AssessmentResult(BaseModel):
     weak_skills: List[str]
     recommendations: List[Dict[str, str]]
 
-def extract_text_from_pdf(pdf_content):
-    """Extract text from PDF content"""
-    try:
-        pdf_file = io.BytesIO(pdf_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        print(f"Error extracting PDF text: {e}")
-        return ""
-
-def extract_text_from_txt(content):
-    """Extract text from TXT content"""
-    try:
-        return content.decode("utf-8", errors="ignore")
-    except Exception as e:
-        print(f"Error extracting TXT text: {e}")
-        return ""
-
 def extract_skills_locally(text):
-    """Extract skills using local pattern matching"""
+    """Extract skills using the precompiled single-pass skill matcher"""
     print("🔧 Using local skill extraction")
     
-    # Common technical skills patterns
-    skill_patterns = {
-        'programming_languages': [
-            'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
-            'kotlin', 'typescript', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash', 'powershell',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server'
-        ],
-        'web_technologies': [
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'spring', 'laravel', 'bootstrap', 'jquery', 'sass', 'less', 'webpack', 'babel',
-            'reactjs', 'react.js', 'nodejs', 'node.js'
-        ],
-        'databases': [
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server',
-            'elasticsearch', 'cassandra', 'dynamodb', 'firebase', 'sql'
-        ],
-        'cloud_devops': [
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab',
-            'terraform', 'ansible', 'chef', 'puppet', 'nagios', 'prometheus', 'grafana'
-        ],
-        'data_ai': [
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn',
-            'pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter', 'tableau', 'power bi'
-        ],
-        'mobile': [
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic'
-        ]
-    }
-    
-    found_skills = set()
-    text_lower = text.lower()
-    
-    # Search for skills in text
-    for category, skills in skill_patterns.items():
-        for skill in skills:
-            # Use word boundaries to avoid partial matches
-            # Handle special characters properly
-            skill_lower = skill.lower()
-            if skill_lower in ['c++', 'c#']:
-                pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            else:
-                pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            if re.search(pattern, text_lower):
-                # Capitalize properly
-                if skill.lower() in ['c++', 'c#']:
-                    found_skills.add(skill.upper())
-                elif skill.lower() == 'node.js':
-                    found_skills.add('Node.js')
-                elif skill.lower() == 'machine learning':
-                    found_skills.add('Machine Learning')
-                elif skill.lower() == 'deep learning':
-                    found_skills.add('Deep Learning')
-                elif skill.lower() == 'sql':
-                    found_skills.add('SQL')
-                elif skill.lower() == 'javascript':
-                    found_skills.add('JavaScript')
-                elif skill.lower() == 'react':
-                    found_skills.add('React')
-                elif skill.lower() == 'reactjs':
-                    found_skills.add('React')
-                elif skill.lower() == 'react.js':
-                    found_skills.add('React')
-                elif skill.lower() == 'nodejs':
-                    found_skills.add('Node.js')
-                else:
-                    found_skills.add(skill.title())
-    
-    # Convert to sorted list
-    skills_list = sorted(list(found_skills))
+    skills_list = skill_matcher.find_skills(text)
     print(f"🎯 Local extraction found {len(skills_list)} skills:")
     for i, skill in enumerate(skills_list):
         print(f"  {i+1}. '{skill}'")
     
     return skills_list
 
-def generate_assessment_with_cohere(skills: List[str], difficulty: str = "intermediate") -> Dict:
-    """Generate assessment using optimized approach (cache + predefined + AI fallback)"""
+# Questions in an assessment assembled from the question bank
+QUESTIONS_PER_ASSESSMENT = int(os.getenv("QUESTIONS_PER_ASSESSMENT", "5"))
+
+async def generate_assessment_with_cohere(skills: List[str], difficulty: str = "intermediate",
+                                          user_id: Optional[str] = None,
+                                          on_question: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Generate assessment using optimized approach (question bank + cache + predefined + AI fallback)
     
-    # For single skill assessments, try optimized approaches first
-    if len(skills) == 1:
-        skill = skills[0]
-        
-        # 1. Check cache first (fastest)
-        cached = get_cached_assessment(skill, difficulty)
-        if cached:
-            print(f"⚡ Using cached assessment for {skill}")
-            return cached
-        
-        # 2. Try predefined assessment (fast)
-        predefined = get_predefined_assessment(skill)
-        if predefined:
-            print(f"📚 Using predefined assessment for {skill}")
-            assessment_data = {
-                "assessment_id": f"predef_{skill.lower()}_{uuid.uuid4().hex[:8]}",
-                "title": f"{skill} Skills Assessment",
-                "difficulty": difficulty,
-                "skills_tested": skills,
-                "questions": predefined["questions"],
-                "created_at": int(time.time()),
-                "source": "predefined"
-            }
-            # Cache the predefined assessment
-            cache_assessment(skill, difficulty, assessment_data)
-            return assessment_data
+    on_question receives LLM-generated questions as they stream in, when this
+    call is the one generating them.
+    """
+    # 'React JS', 'reactjs' and 'React' share one cache entry and question bank
+    skills = skill_registry.normalize_skills(skills)
+    if not skills:
+        raise ValueError("No skills provided")
     
-    # 3. Fallback to AI generation (slower but more flexible)
-    if not cohere_client:
-        print("⚠️ Cohere AI not available, using fallback assessment generation")
-        return create_structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
+    for skill in skills:
+        assessment_demand.record(skill, difficulty)
+    
+    # Multi-skill assessments are assembled skill by skill
+    if len(skills) > 1:
+        return await compose_assessment(skills, difficulty, user_id, on_question)
+    
+    # 0. Sample the question bank (an indexed query) when it has enough unseen questions
+    low_skills = []
+    if database_available:
+        banked, low_skills = await assessment_from_question_bank(skills, difficulty, user_id)
+        if banked:
+            return banked
+    
+    skill = skills[0]
     
+    # 1. Check cache first (fastest); concurrent misses share one generation
+    assessment = await get_or_generate_assessment(
+        skill, difficulty, lambda: generate_skill_assessment_uncached(skill, difficulty, on_question)
+    )
+    
+    # LLM generations already fill the bank; otherwise top up the pools that ran low
+    if assessment.get("source") not in ("ai_generated", "ai_partial"):
+        for skill in low_skills:
+            schedule_question_bank_top_up(skill, difficulty)
+    return assessment
+
+async def compose_assessment(skills: List[str], difficulty: str, user_id: Optional[str] = None,
+                             on_question: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Multi-skill assessment built per skill from the question bank, cache and predefined sets
+    
+    Only skills with no stored questions go to the LLM, together in one call.
+    """
+    skills = skills[:QUESTIONS_PER_ASSESSMENT]
+    per_skill = max(1, QUESTIONS_PER_ASSESSMENT // len(skills))
+    by_skill = {}
+    low_skills = []
+    
+    for skill in skills:
+        questions = []
+        if database_available:
+            try:
+                questions, remaining = await sample_bank_questions(skill, difficulty, per_skill, user_id)
+                if remaining < QUESTION_BANK_MIN_POOL:
+                    low_skills.append(skill)
+            except Exception as e:
+                print(f"⚠️ Question bank unavailable: {e}")
+        if len(questions) < per_skill:
+            stored = get_cached_skill_questions(skill, difficulty) or \
+                (get_predefined_assessment(skill) or {}).get("questions", [])
+            taken = {question["question"] for question in questions}
+            unused = [question for question in stored if question["question"] not in taken]
+            questions += random.sample(unused, min(per_skill - len(questions), len(unused)))
+        by_skill[skill] = questions
+    
+    missing = [skill for skill in skills if not by_skill[skill]]
+    generated = await generate_skill_questions(missing, difficulty, per_skill, on_question) if missing else {}
+    for skill in missing:
+        by_skill[skill] = generated.get(skill, [])[:per_skill]
+    
+    # Anything the LLM couldn't cover gets a starter or generic question
+    uncovered = [skill for skill in skills if not by_skill[skill]]
+    if uncovered:
+        fallback = create_structured_assessment(uncovered, difficulty, "")
+        for question in fallback["questions"]:
+            by_skill[question["skill"]].append(question)
+    
+    questions = []
+    for skill in skills:
+        for question in by_skill[skill]:
+            questions.append(dict(question, id=f"q{len(questions) + 1}", skill=skill))
+    
+    bank_ids = [question["bank_id"] for question in questions if question.get("bank_id")]
+    if database_available and bank_ids:
+        await record_served_questions(user_id, bank_ids)
+    for skill in low_skills:
+        if skill not in missing:
+            schedule_question_bank_top_up(skill, difficulty)
+    
+    print(f"🧩 Composed assessment for {len(skills)} skills ({len(missing)} generated)")
+    return {
+        "assessment_id": f"composed_{uuid.uuid4().hex}",
+        "title": "Technical Skills Assessment",
+        "difficulty": difficulty,
+        "skills_tested": skills,
+        "questions": questions,
+        "created_at": int(time.time()),
+        "source": "composed"
+    }
+
+async def generate_skill_questions(skills: List[str], difficulty: str, per_skill: int,
+                                  on_question: Optional[Callable[[Dict], None]] = None) -> Dict[str, List[Dict]]:
+    """Generate questions for several skills in one LLM call, grouped by skill
+    
+    Concurrent requests missing the same skills share the call. Successful
+    generations are kept per skill in the cache (and the bank) for later
+    compositions.
+    """
+    flight = ("batch", difficulty, per_skill, tuple(sorted(skill_registry.cache_key(skill) for skill in skills)))
+    
+    async def generate():
+        assessment = await generate_ai_assessment(skills, difficulty, per_skill * len(skills), on_question)
+        requested = {skill_registry.cache_key(skill): skill for skill in skills}
+        grouped = {}
+        for question in assessment.get("questions", []):
+            skill = requested.get(skill_registry.cache_key(question.get("skill") or ""))
+            if skill is not None:
+                grouped.setdefault(skill, []).append(dict(question, skill=skill))
+        if assessment.get("source") == "ai_generated":
+            for skill, questions in grouped.items():
+                cache_skill_questions(skill, difficulty, questions)
+        return grouped
+    
+    return await assessment_flights.run(flight, generate)
+
+async def generate_skill_assessment_uncached(skill: str, difficulty: str,
+                                            on_question: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Build a single-skill assessment on a cache miss (predefined, else AI)"""
+    skills = [skill]
+    
+    # 2. Try predefined assessment (fast)
+    predefined = get_predefined_assessment(skill)
+    if predefined:
+        print(f"📚 Using predefined assessment for {skill}")
+        return {
+            "assessment_id": f"predef_{skill.lower()}_{uuid.uuid4().hex[:8]}",
+            "title": f"{skill} Skills Assessment",
+            "difficulty": difficulty,
+            "skills_tested": skills,
+            "questions": predefined["questions"],
+            "created_at": int(time.time()),
+            "source": "predefined"
+        }
+    
+    return await generate_ai_assessment(skills, difficulty, on_question=on_question)
+
+async def assessment_from_question_bank(skills: List[str], difficulty: str,
+                                       user_id: Optional[str]) -> Tuple[Optional[Dict], List[str]]:
+    """Assessment sampled from the bank (None if any skill lacks unseen questions) and the skills running low
+    
+    When the assessment is served, low pools are topped up by the LLM in the background.
+    """
+    skills = skills[:QUESTIONS_PER_ASSESSMENT]
+    per_skill = max(1, QUESTIONS_PER_ASSESSMENT // len(skills))
+    questions = []
+    low_skills = []
+    complete = True
+    for skill in skills:
+        try:
+            sampled, remaining = await sample_bank_questions(skill, difficulty, per_skill, user_id)
+        except Exception as e:
+            print(f"⚠️ Question bank unavailable: {e}")
+            return None, []
+        if remaining < QUESTION_BANK_MIN_POOL:
+            low_skills.append(skill)
+        complete = complete and len(sampled) == per_skill
+        questions.extend(sampled)
+    if not complete:
+        return None, low_skills
+    
+    await record_served_questions(user_id, [question["bank_id"] for question in questions])
+    for skill in low_skills:
+        schedule_question_bank_top_up(skill, difficulty)
+    print(f"🏦 Using question bank for {', '.join(skills)}")
+    return {
+        "assessment_id": f"bank_{uuid.uuid4().hex}",
+        "title": f"{skills[0]} Skills Assessment" if len(skills) == 1 else "Technical Skills Assessment",
+        "difficulty": difficulty,
+        "skills_tested": skills,
+        "questions": questions,
+        "created_at": int(time.time()),
+        "source": "question_bank"
+    }, low_skills
+
+# Running bank top-ups, kept referenced until they finish
+question_bank_top_ups = set()
+
+def schedule_question_bank_top_up(skill: str, difficulty: str):
+    """Start a background LLM top-up of a skill's pool unless one is already running"""
+    if not llm_gateway or not assessment_cache_available:
+        return
+    key = f"question_bank_top_up_{skill_registry.cache_key(skill)}_{difficulty}"
+    task = asyncio.create_task(assessment_flights.run(key, lambda: top_up_question_bank(key, skill, difficulty)))
+    question_bank_top_ups.add(task)
+    task.add_done_callback(question_bank_top_ups.discard)
+
+async def top_up_question_bank(lease: str, skill: str, difficulty: str):
+    # Single-flight covers this worker; the lease in the shared cache store covers the others
+    if not assessment_cache.acquire_lease(lease, WORKER_ID, ASSESSMENT_LEASE_SECONDS):
+        return
     try:
-        print(f"🤖 Generating AI assessment for {len(skills)} skills...")
-        prompt = f"""
+        print(f"🏦 Topping up the question bank for {skill} ({difficulty})")
+        # generate_ai_assessment adds what it generates to the bank
+        await generate_ai_assessment([skill], difficulty, question_count=QUESTION_BANK_TOPUP_SIZE)
+    except Exception as e:
+        print(f"⚠️ Question bank top-up for {skill} failed: {e}")
+    finally:
+        assessment_cache.release_lease(lease, WORKER_ID)
+
+async def bank_generated_questions(questions: List[Dict], skills: List[str], difficulty: str):
+    """Keep LLM-generated questions in the bank for later assessments"""
+    if not database_available:
+        return
+    try:
+        added = await add_bank_questions(generated_question_rows(questions, skills, difficulty))
+        if added:
+            print(f"🏦 Added {added} generated questions to the question bank")
+    except Exception as e:
+        print(f"⚠️ Could not add generated questions to the question bank: {e}")
+
+async def structured_assessment(skills: List[str], difficulty: str, response_text: str) -> Dict:
+    """create_structured_assessment with one bank question per skill where the bank has one"""
+    bank_questions = {}
+    if database_available:
+        for skill in skills[:5]:
+            try:
+                sampled, _ = await sample_bank_questions(skill, difficulty, 1)
+            except Exception as e:
+                print(f"⚠️ Question bank unavailable: {e}")
+                break
+            if sampled:
+                bank_questions[skill] = sampled[0]
+    return create_structured_assessment(skills, difficulty, response_text, bank_questions)
+
+def assessment_prompt(skills: List[str], difficulty: str, question_count: int) -> str:
+    return f"""
         Create a technical assessment for the following skills: {', '.join(skills)}
         Difficulty level: {difficulty}
         
-        Generate 5 multiple choice questions (1 question per skill) with the following format:
+        Generate {question_count} multiple choice questions (spread evenly across the skills) with the following format:
         {{
-            "assessment_id": "unique_id_here",
             "title": "Technical Skills Assessment",
             "difficulty": "{difficulty}",
             "skills_tested": {skills},
@@ -281,97 +427,86 @@ def generate_assessment_with_cohere(skills: List[str], difficulty: str = "interm
             ]
         }}
         
+        Set each question's "skill" to exactly one of: {', '.join(skills)}
         Make questions practical and relevant to real-world scenarios. Return ONLY the JSON, no additional text.
         """
-        
-        response = cohere_client.generate(
-            model="command",
-            prompt=prompt,
-            max_tokens=1000,
-            temperature=0.7
-        )
-        
-        # Parse the response
-        assessment_text = response.generations[0].text.strip()
-        
-        # Try to extract JSON from the response
+
+async def generate_ai_assessment(skills: List[str], difficulty: str, question_count: int = 5,
+                                 on_question: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Generate an assessment with the LLM, falling back to a structured one
+    
+    The completion is streamed and parsed incrementally: on_question gets each
+    question as soon as it is complete, and if the stream is cut off or a
+    question is malformed, the valid questions are still kept (as an
+    "ai_partial" assessment when the tail is missing).
+    """
+    # 3. Fallback to AI generation (slower but more flexible)
+    if not llm_gateway:
+        print("⚠️ Cohere AI not available, using fallback assessment generation")
+        return await structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
+    
+    parser = QuestionStreamParser()
+    questions = []
+    
+    def accept(question: Dict):
+        question = dict(question, id=f"q{len(questions) + 1}")
+        questions.append(question)
+        if on_question:
+            on_question(question)
+    
+    try:
+        print(f"🤖 Generating AI assessment for {len(skills)} skills...")
+        prompt = assessment_prompt(skills, difficulty, question_count)
         try:
-            # Find JSON in the response
-            start_idx = assessment_text.find('{')
-            end_idx = assessment_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = assessment_text[start_idx:end_idx]
-                assessment_data = json.loads(json_str)
-            else:
-                raise Exception("No JSON found in response")
-        except json.JSONDecodeError:
-            # If JSON parsing fails, create a structured response
-            print(f"⚠️ JSON parsing failed, creating structured assessment from: {assessment_text[:100]}...")
-            assessment_data = create_structured_assessment(skills, difficulty, assessment_text)
-        
-        # Add timestamp and source
-        assessment_data["created_at"] = int(time.time())
-        assessment_data["source"] = "ai_generated"
-        
-        # Cache AI-generated assessments
-        if len(skills) == 1:
-            cache_assessment(skills[0], difficulty, assessment_data)
-        
-        print(f"✅ Generated AI assessment for {len(skills)} skills")
-        return assessment_data
-        
+            async for chunk in llm_gateway.generate_stream(prompt, max_tokens=1000, temperature=0.7):
+                for question in parser.feed(chunk):
+                    accept(question)
+        except Exception as e:
+            if not questions:
+                raise
+            print(f"⚠️ Generation stream failed after {len(questions)} questions: {e!r}")
+        for question in parser.finish():
+            accept(question)
     except Exception as e:
         print(f"❌ Error generating assessment: {e}")
         # Fallback to structured assessment
-        return create_structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
-
-def create_structured_assessment(skills: List[str], difficulty: str, response_text: str) -> Dict:
-    """Create structured assessment from Cohere response"""
-    import uuid
+        return await structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
     
-    # Pre-defined questions for common skills
-    skill_questions = {
-        "JavaScript": {
-            "question": "What is the correct way to declare a variable in JavaScript?",
-            "options": ["var x = 5;", "variable x = 5;", "v x = 5;", "declare x = 5;"],
-            "correct_answer": "var x = 5;",
-            "explanation": "var is the traditional way to declare variables in JavaScript"
-        },
-        "Python": {
-            "question": "Which of the following is used to create a list in Python?",
-            "options": ["[]", "()", "{}", "<>"],
-            "correct_answer": "[]",
-            "explanation": "Square brackets [] are used to create lists in Python"
-        },
-        "Java": {
-            "question": "What is the main method signature in Java?",
-            "options": [
-                "public static void main(String[] args)",
-                "public void main(String[] args)",
-                "static void main(String[] args)",
-                "public static main(String[] args)"
-            ],
-            "correct_answer": "public static void main(String[] args)",
-            "explanation": "The main method must be public, static, and return void"
-        },
-        "React": {
-            "question": "What hook is used to manage state in functional components?",
-            "options": ["useState", "useEffect", "useContext", "useReducer"],
-            "correct_answer": "useState",
-            "explanation": "useState is the primary hook for managing state in functional components"
-        },
-        "SQL": {
-            "question": "Which SQL command is used to retrieve data from a database?",
-            "options": ["SELECT", "INSERT", "UPDATE", "DELETE"],
-            "correct_answer": "SELECT",
-            "explanation": "SELECT is used to retrieve data from database tables"
-        }
+    if parser.skipped:
+        print(f"⚠️ Skipped {parser.skipped} malformed generated questions")
+    if not questions:
+        # Nothing usable in the response; a structured assessment is not cached or banked
+        print("⚠️ No complete questions in the generated assessment, creating structured assessment")
+        return await structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
+    
+    await bank_generated_questions(questions, skills, difficulty)
+    complete = parser.complete
+    print(f"✅ Generated AI assessment for {len(skills)} skills"
+          + ("" if complete else f" (truncated after {len(questions)} questions)"))
+    return {
+        "assessment_id": f"ai_{uuid.uuid4().hex}",
+        "title": f"{skills[0]} Skills Assessment" if len(skills) == 1 else "Technical Skills Assessment",
+        "difficulty": difficulty,
+        "skills_tested": skills,
+        "questions": questions,
+        "created_at": int(time.time()),
+        "source": "ai_generated" if complete else "ai_partial"
     }
+
+def create_structured_assessment(skills: List[str], difficulty: str, response_text: str,
+                                 bank_questions: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Create structured assessment from Cohere response
+    
+    Uses bank_questions (skill -> bank question) first, then the starter
+    questions, then a generic question for unknown skills.
+    """
+    import uuid
+    bank_questions = bank_questions or {}
     
     questions = []
     for i, skill in enumerate(skills[:5]):  # Limit to 5 questions
-        if skill in skill_questions:
-            q_data = skill_questions[skill]
+        q_data = bank_questions.get(skill) or skill_registry.lookup(STARTER_QUESTIONS, skill)
+        if q_data:
             questions.append({
                 "id": f"q{i+1}",
                 "skill": skill,
@@ -404,100 +539,53 @@ def create_structured_assessment(skills: List[str], difficulty: str, response_te
         "questions": questions
     }
 
-def analyze_assessment_results(assessment_id: str, answers: Dict[str, str], skills: List[str]) -> Dict:
-    """Analyze assessment results and identify weak skills using Cohere"""
-    if not cohere_client:
-        print("⚠️ Cohere AI not available, using fallback assessment analysis")
-        # Calculate score for fallback analysis
-        total_questions = len(answers)
-        correct_answers = sum(1 for answer in answers.values() if answer == "correct")
-        score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-        return create_structured_analysis(assessment_id, score, skills)
+async def analyze_assessment_results(assessment_id: str, grade: Dict, skills: List[str], ai_improvement_plan: bool = False) -> Dict:
+    """Analyze graded assessment results locally, optionally asking Cohere for the improvement plan"""
+    analysis = create_structured_analysis(assessment_id, grade["score"], skills, grade["skill_scores"])
+    
+    if not ai_improvement_plan:
+        return analysis
+    
+    if not llm_gateway:
+        print("⚠️ Cohere AI not available, using local improvement plan")
+        return analysis
     
     try:
-        # Calculate basic score
-        total_questions = len(answers)
-        correct_answers = sum(1 for answer in answers.values() if answer == "correct")
-        score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-        
-        # Generate analysis prompt
+        skill_lines = "\n".join(
+            f"        - {skill}: {skill_score(skill, grade['skill_scores'], grade['score']):.0f}%"
+            for skill in skills
+        )
         prompt = f"""
-        Analyze the assessment results:
-        - Skills tested: {', '.join(skills)}
-        - Score: {score}%
-        - Total questions: {total_questions}
-        - Correct answers: {correct_answers}
-        
-        Identify weak skills and provide video recommendations. Return JSON format:
-        {{
-            "assessment_id": "{assessment_id}",
-            "score": {score},
-            "weak_skills": ["skill1", "skill2"],
-            "recommendations": [
-                {{
-                    "skill": "skill_name",
-                    "video_title": "Video Title",
-                    "video_url": "https://youtube.com/watch?v=...",
-                    "description": "Why this video is recommended"
-                }}
-            ],
-            "improvement_plan": "Personalized improvement suggestions"
-        }}
+        A learner finished a technical assessment with an overall score of {grade['score']:.0f}%.
+        Per-skill scores:
+{skill_lines}
+        Weak skills: {', '.join(analysis['weak_skills']) or 'none'}
         
-        Focus on skills where the user scored poorly or showed gaps. Return ONLY the JSON, no additional text.
+        Write a short, personalized improvement plan (3-5 sentences) focused on the weak skills.
+        Return ONLY the plan text.
         """
         
-        response = cohere_client.generate(
-            model="command",
-            prompt=prompt,
-            max_tokens=800,
-            temperature=0.5
-        )
-        
-        # Parse the response
-        analysis_text = response.generations[0].text.strip()
-        
-        try:
-            # Find JSON in the response
-            start_idx = analysis_text.find('{')
-            end_idx = analysis_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = analysis_text[start_idx:end_idx]
-                analysis_data = json.loads(json_str)
-                
-                # Enhance AI analysis with curated video recommendations
-                if "recommendations" not in analysis_data or not analysis_data["recommendations"]:
-                    recommendations = []
-                    for skill in skills:
-                        skill_videos = get_video_recommendations(skill, score)
-                        recommendations.extend(skill_videos)
-                    analysis_data["recommendations"] = recommendations
-            else:
-                raise Exception("No JSON found in response")
-        except json.JSONDecodeError:
-            # If JSON parsing fails, create a structured analysis
-            print(f"⚠️ JSON parsing failed for analysis, creating structured response")
-            analysis_data = create_structured_analysis(assessment_id, score, skills)
-        
-        print(f"✅ Analyzed assessment results with Cohere - Score: {score}%")
-        return analysis_data
+        improvement_plan = (await llm_gateway.generate(prompt, max_tokens=300, temperature=0.5)).strip()
+        if improvement_plan:
+            analysis["improvement_plan"] = improvement_plan
         
+        print(f"✅ Generated improvement plan with Cohere - Score: {grade['score']}%")
     except Exception as e:
-        print(f"❌ Error analyzing results: {e}")
-        # Fallback to structured analysis
-        return create_structured_analysis(assessment_id, score, skills)
+        print(f"❌ Error generating improvement plan: {e}")
+    
+    return analysis
 
-def create_structured_analysis(assessment_id: str, score: float, skills: List[str]) -> Dict:
-    """Create structured analysis with improved video recommendations"""
-    # Determine weak skills based on score
-    weak_skills = []
-    if score < 40:  # Changed from 80 to 40 to only mark skills below 40% as weak
-        weak_skills = skills  # Skills need improvement if score is low
+def create_structured_analysis(assessment_id: str, score: float, skills: List[str], skill_scores: Optional[Dict] = None) -> Dict:
+    """Create structured analysis with per-skill weak skills and curated video recommendations"""
+    skill_scores = skill_scores or {}
+    
+    # Judge each skill on its own questions; untested skills use the overall score
+    weak_skills = find_weak_skills(skills, skill_scores, score)
     
     # Generate recommendations using curated video system
     recommendations = []
     for skill in weak_skills:
-        skill_videos = get_video_recommendations(skill, score)
+        skill_videos = get_video_recommendations(skill, skill_score(skill, skill_scores, score))
         recommendations.extend(skill_videos)
     
     # Create improvement plan based on score
@@ -507,19 +595,90 @@ def create_structured_analysis(assessment_id: str, score: float, skills: List[st
         improvement_plan = "Good foundation! Continue practicing to strengthen your skills further."
     elif score >= 40:
         improvement_plan = "Average performance. Consider additional practice to improve your skills."
-    else:
+    elif weak_skills:
         improvement_plan = f"Need improvement in {', '.join(weak_skills)}. Start with the recommended beginner videos and practice regularly."
+    else:
+        improvement_plan = "Need improvement. Start with the recommended beginner videos and practice regularly."
+    
+    # A good overall score can still hide individual weak skills
+    if weak_skills and score >= 40:
+        improvement_plan += f" Focus next on {', '.join(weak_skills)}."
     
     return {
         "assessment_id": assessment_id,
         "score": score,
         "weak_skills": weak_skills,
+        "skill_scores": skill_scores,
         "recommendations": recommendations,
         "improvement_plan": improvement_plan
     }
 
-# In-memory storage for assessments (in production, use a database)
-assessments_db = {}
+# Generated assessments are kept until submission for this long
+ASSESSMENT_SESSION_TTL_SECONDS = int(os.getenv("ASSESSMENT_SESSION_TTL_SECONDS", "86400"))
+
+# Seconds between full recomputes of the incrementally maintained dashboard metrics
+DASHBOARD_METRICS_RECONCILE_SECONDS = int(os.getenv("DASHBOARD_METRICS_RECONCILE_SECONDS", "300"))
+
+# Seconds between purges of expired assessment sessions
+ASSESSMENT_SESSION_CLEANUP_SECONDS = int(os.getenv("ASSESSMENT_SESSION_CLEANUP_SECONDS", "600"))
+
+# Bounded fallback store for assessment sessions when the database is unavailable
+assessment_session_fallback = create_cache(
+    "assessment_sessions",
+    int(os.getenv("ASSESSMENT_SESSION_MAX_SIZE", "10000")),
+    ASSESSMENT_SESSION_TTL_SECONDS
+)
+
+async def store_assessment(assessment: Dict):
+    """Persist a generated assessment and its answer key so any worker can grade it"""
+    stored = dict(assessment, answer_key=build_answer_key(assessment))
+    if database_available:
+        await save_assessment_session(stored, ASSESSMENT_SESSION_TTL_SECONDS)
+    else:
+        assessment_session_fallback.set(assessment["assessment_id"], stored)
+
+async def load_assessment(assessment_id: str) -> Optional[Dict]:
+    """Look up a stored assessment by ID"""
+    if database_available:
+        return await get_assessment_session(assessment_id)
+    return assessment_session_fallback.get(assessment_id)
+
+async def load_assessments(assessment_ids: List[str]) -> Dict[str, Dict]:
+    """Look up many stored assessments at once, keyed by ID"""
+    if database_available:
+        return await get_assessment_sessions(assessment_ids)
+    found = {}
+    for assessment_id in assessment_ids:
+        assessment = assessment_session_fallback.get(assessment_id)
+        if assessment:
+            found[assessment_id] = assessment
+    return found
+
+def purge_expired_assessments():
+    if database_available:
+        deleted = delete_expired_assessment_sessions()
+    else:
+        deleted = assessment_session_fallback.sweep()
+    if deleted:
+        print(f"🧹 Removed {deleted} expired assessment sessions")
+
+async def run_periodically(interval: float, func):
+    """Run a blocking maintenance function every interval seconds off the event loop"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(func)
+        except Exception as e:
+            print(f"⚠️ Background task {func.__name__} failed: {e}")
+
+background_tasks = []
+
+# Keeps the most-requested skills' assessments generated ahead of expiry (needs the LLM)
+assessment_prewarmer = AssessmentPrewarmer(generate_skill_assessment_uncached, assessment_demand) \
+    if assessment_cache_available else None
+
+# Login telemetry is written in batches by a background task
+login_event_buffer = LoginEventBuffer(save_login_logs_bulk) if database_available else None
 
 # Create uploads directory if it doesn't exist
 UPLOADS_DIR = "uploads"
@@ -529,26 +688,84 @@ os.makedirs(VIDEOS_DIR, exist_ok=True)
 # Mount static files for video access
 app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 
+@app.on_event("startup")
+async def start_background_tasks():
+    if assessment_cache_available:
+        assessment_cache.start_sweeper()
+    resume_analysis_cache.start_sweeper()
+    background_tasks.append(asyncio.create_task(
+        run_periodically(ASSESSMENT_SESSION_CLEANUP_SECONDS, purge_expired_assessments)
+    ))
+    if database_available:
+        background_tasks.append(asyncio.create_task(
+            run_periodically(DASHBOARD_METRICS_RECONCILE_SECONDS, update_dashboard_metrics)
+        ))
+    if login_event_buffer:
+        login_event_buffer.start()
+    if assessment_prewarmer and llm_gateway:
+        background_tasks.append(asyncio.create_task(assessment_prewarmer.run()))
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    if assessment_cache_available:
+        assessment_cache.stop_sweeper()
+    resume_analysis_cache.stop_sweeper()
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    if login_event_buffer:
+        # Flush buffered login events before exiting
+        await login_event_buffer.stop()
+    if llm_gateway:
+        await llm_gateway.aclose()
+    if database_available:
+        await dispose_async_engine()
+    shutdown_parser_pool()
+
 @app.get("/")
 def root():
     return {"message": "Resume Skill Extractor & Assessment System is running!", "version": "2.0.0"}
 
+# Analysis results for resume files seen before, keyed by content hash
+RESUME_CACHE_MAX_SIZE = int(os.getenv("RESUME_CACHE_MAX_SIZE", "5000"))
+RESUME_CACHE_TTL_SECONDS = float(os.getenv("RESUME_CACHE_TTL_SECONDS", str(7 * 86400)))
+resume_analysis_cache = create_cache("resume_analysis", RESUME_CACHE_MAX_SIZE, RESUME_CACHE_TTL_SECONDS)
+
+def resume_cache_key(content: bytes, filename: str) -> str:
+    """Key on the file bytes and the skill vocabulary version, so vocabulary changes invalidate entries"""
+    file_type = "pdf" if filename.lower().endswith('.pdf') else "txt"
+    return f"{skill_matcher.version}:{file_type}:{hashlib.sha256(content).hexdigest()}"
+
 @app.post("/analyze_resume")
 async def analyze_resume(file: UploadFile = File(...)):
     try:
-        content = await file.read()
+        content = await file.read(RESUME_MAX_BYTES + 1)
+        if len(content) > RESUME_MAX_BYTES:
+            return {"error": f"Resume is larger than the {RESUME_MAX_BYTES // (1024 * 1024)}MB limit"}
         
-        # Extract text based on file type
-        if file.filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(content)
-        else:
-            text = extract_text_from_txt(content)
+        # Same file analyzed before with the current vocabulary
+        cache_key = resume_cache_key(content, file.filename)
+        cached = resume_analysis_cache.get(cache_key)
+        if cached:
+            print(f"⚡ Using cached resume analysis for {file.filename}")
+            return {
+                "skills": cached["skills"],
+                "filename": file.filename,
+                "text_length": cached["text_length"],
+                "skills_count": len(cached["skills"]),
+                "extraction_method": "local_patterns",
+                "cached": True
+            }
+        
+        # Extract text based on file type (PDFs are parsed in a worker process)
+        text = await extract_resume_text(content, file.filename)
         
         if not text.strip():
             return {"error": "Could not extract text from the uploaded file"}
 
         # Extract skills using local method
         skills = extract_skills_locally(text)
+        resume_analysis_cache.set(cache_key, {"skills": skills, "text_length": len(text)})
         
         return {
             "skills": skills,
@@ -562,6 +779,84 @@ async def analyze_resume(file: UploadFile = File(...)):
         print(f"Error processing resume: {e}")
         return {"error": f"Error processing resume: {str(e)}"}
 
+async def analyze_batch_item(filename: str, content: Optional[bytes], error: Optional[str]) -> Dict:
+    """Analyze one resume of a batch, reporting failures as an error entry"""
+    if error:
+        return {"filename": filename, "error": error}
+    try:
+        cache_key = resume_cache_key(content, filename)
+        result = resume_analysis_cache.get(cache_key)
+        cached = result is not None
+        if not cached:
+            result = await analyze_resume_in_pool(content, filename)
+            if "error" in result:
+                return {"filename": filename, "error": result["error"]}
+            resume_analysis_cache.set(cache_key, result)
+        return {
+            "filename": filename,
+            "skills": result["skills"],
+            "text_length": result["text_length"],
+            "skills_count": len(result["skills"]),
+            "cached": cached
+        }
+    except Exception as e:
+        print(f"Error processing resume {filename}: {e}")
+        return {"filename": filename, "error": f"Error processing resume: {str(e)}"}
+
+@app.post("/analyze_resumes")
+async def analyze_resumes(files: List[UploadFile] = File(...)):
+    """Bulk resume ingestion for candidate imports
+    
+    Accepts many PDF/TXT files and/or zip archives of them. Streams NDJSON: one
+    line per file as soon as it is analyzed, then a summary line with throughput.
+    """
+    start_time = time.perf_counter()
+    items = []
+    batch_bytes = 0
+    for upload in files:
+        content = await upload.read(RESUME_BATCH_MAX_BYTES + 1)
+        batch_bytes += len(content)
+        if batch_bytes > RESUME_BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Batch is larger than the {RESUME_BATCH_MAX_BYTES // (1024 * 1024)}MB limit")
+        
+        if upload.filename.lower().endswith('.zip'):
+            # Entry count and uncompressed size count against the batch limits
+            try:
+                for item in iter_zip_resumes(content, RESUME_BATCH_MAX_FILES - len(items),
+                                             RESUME_BATCH_MAX_BYTES - batch_bytes):
+                    items.append(item)
+                    batch_bytes += len(item[1] or b"")
+            except ResumeBatchTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            except Exception as e:
+                items.append((upload.filename, None, f"Could not read zip archive: {str(e)}"))
+        elif len(content) > RESUME_MAX_BYTES:
+            items.append((upload.filename, None, f"Resume is larger than the {RESUME_MAX_BYTES // (1024 * 1024)}MB limit"))
+        else:
+            items.append((upload.filename, content, None))
+    
+    if len(items) > RESUME_BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Batch has more than {RESUME_BATCH_MAX_FILES} resumes")
+    
+    async def stream_results():
+        succeeded = 0
+        for next_result in asyncio.as_completed([analyze_batch_item(*item) for item in items]):
+            result = await next_result
+            if "error" not in result:
+                succeeded += 1
+            yield json.dumps(result) + "\n"
+        
+        elapsed = time.perf_counter() - start_time
+        yield json.dumps({"summary": {
+            "files": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "elapsed_seconds": round(elapsed, 3),
+            "resumes_per_second": round(len(items) / elapsed, 2) if elapsed > 0 else None
+        }}) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.post("/generate_assessment")
 async def generate_assessment(request: AssessmentRequest):
     """Generate assessment based on extracted skills"""
@@ -570,11 +865,10 @@ async def generate_assessment(request: AssessmentRequest):
             raise HTTPException(status_code=400, detail="No skills provided")
         
         # Generate assessment using Cohere AI
-        assessment = generate_assessment_with_cohere(request.skills, request.difficulty)
+        assessment = await generate_assessment_with_cohere(request.skills, request.difficulty, request.user_id)
         
-        # Store assessment in memory
-        assessment_id = assessment["assessment_id"]
-        assessments_db[assessment_id] = assessment
+        # Store assessment until it is submitted
+        await store_assessment(assessment)
         
         return {
             "success": True,
@@ -586,6 +880,58 @@ async def generate_assessment(request: AssessmentRequest):
         print(f"Error generating assessment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/generate_assessment/stream")
+async def generate_assessment_stream(request: AssessmentRequest):
+    """Generate an assessment as Server-Sent Events
+    
+    Sends a "question" event for each question as soon as the LLM finishes
+    writing it (all at once for questions from the bank or cache), then an
+    "assessment" event with the stored assessment, whose question ids are the
+    ones to submit, or an "error" event.
+    """
+    if not request.skills:
+        raise HTTPException(status_code=400, detail="No skills provided")
+    
+    streamed = asyncio.Queue()
+    generation = asyncio.create_task(generate_assessment_with_cohere(
+        request.skills, request.difficulty, request.user_id, on_question=streamed.put_nowait
+    ))
+    
+    async def stream_events():
+        sent = set()
+        try:
+            while not generation.done() or not streamed.empty():
+                if streamed.empty():
+                    next_question = asyncio.ensure_future(streamed.get())
+                    await asyncio.wait({next_question, generation}, return_when=asyncio.FIRST_COMPLETED)
+                    if not next_question.done():
+                        next_question.cancel()
+                        continue
+                    question = next_question.result()
+                else:
+                    question = streamed.get_nowait()
+                sent.add(question["question"])
+                yield sse_event("question", question)
+            
+            assessment = generation.result()
+            for question in assessment["questions"]:
+                if question["question"] not in sent:
+                    yield sse_event("question", question)
+            await store_assessment(assessment)
+            yield sse_event("assessment", assessment)
+        except Exception as e:
+            print(f"Error streaming assessment: {e}")
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            # Client went away; shared generations are shielded and carry on
+            generation.cancel()
+    
+    return StreamingResponse(stream_events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.post("/generate_skill_assessment")
 async def generate_skill_assessment(request: AssessmentRequest):
     """Generate individual assessment for a single skill"""
@@ -596,11 +942,10 @@ async def generate_skill_assessment(request: AssessmentRequest):
         skill = request.skills[0]
         
         # Generate assessment using Cohere AI for single skill
-        assessment = generate_assessment_with_cohere([skill], request.difficulty)
+        assessment = await generate_assessment_with_cohere([skill], request.difficulty, request.user_id)
         
-        # Store assessment in memory
-        assessment_id = assessment["assessment_id"]
-        assessments_db[assessment_id] = assessment
+        # Store assessment until it is submitted
+        await store_assessment(assessment)
         
         return {
             "success": True,
@@ -612,32 +957,52 @@ async def generate_skill_assessment(request: AssessmentRequest):
         print(f"Error generating skill assessment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def generate_skill_assessment_entry(skill: str, difficulty: str, semaphore: asyncio.Semaphore,
+                                          user_id: Optional[str] = None) -> Dict:
+    """Generate one skill's assessment, reporting failures as an error entry"""
+    async with semaphore:
+        try:
+            assessment = await generate_assessment_with_cohere([skill], difficulty, user_id)
+            assessment_id = assessment["assessment_id"]
+            await store_assessment(assessment)
+            return {
+                "skill": skill,
+                "assessment_id": assessment_id,
+                "assessment": assessment
+            }
+        except Exception as e:
+            print(f"Error generating assessment for {skill}: {e}")
+            return {
+                "skill": skill,
+                "error": str(e)
+            }
+
 @app.post("/generate_all_skill_assessments")
-async def generate_all_skill_assessments(request: AssessmentRequest):
-    """Generate individual assessments for each skill"""
+async def generate_all_skill_assessments(request: AssessmentRequest, stream: bool = False):
+    """Generate individual assessments for each skill concurrently
+    
+    With ?stream=true the response is NDJSON, one line per skill as soon as it is ready.
+    """
     try:
         if not request.skills:
             raise HTTPException(status_code=400, detail="No skills provided")
         
-        assessments = []
+        semaphore = asyncio.Semaphore(ASSESSMENT_FANOUT_CONCURRENCY)
+        entries = [
+            generate_skill_assessment_entry(skill, request.difficulty, semaphore, request.user_id)
+            for skill in request.skills
+        ]
         
-        # Generate individual assessment for each skill
-        for skill in request.skills:
-            try:
-                assessment = generate_assessment_with_cohere([skill], request.difficulty)
-                assessment_id = assessment["assessment_id"]
-                assessments_db[assessment_id] = assessment
-                assessments.append({
-                    "skill": skill,
-                    "assessment_id": assessment_id,
-                    "assessment": assessment
-                })
-            except Exception as e:
-                print(f"Error generating assessment for {skill}: {e}")
-                assessments.append({
-                    "skill": skill,
-                    "error": str(e)
-                })
+        if stream:
+            async def stream_assessments():
+                for next_entry in asyncio.as_completed(entries):
+                    entry = await next_entry
+                    yield json.dumps(entry) + "\n"
+            
+            return StreamingResponse(stream_assessments(), media_type="application/x-ndjson")
+        
+        # Results keep the order of request.skills
+        assessments = await asyncio.gather(*entries)
         
         return {
             "success": True,
@@ -654,28 +1019,20 @@ async def submit_assessment(submission: AssessmentSubmission):
     """Submit assessment answers and get analysis"""
     try:
         # Get the original assessment
-        assessment = assessments_db.get(submission.assessment_id)
+        assessment = await load_assessment(submission.assessment_id)
         if not assessment:
             raise HTTPException(status_code=404, detail="Assessment not found")
         
-        # Check answers against correct answers
-        checked_answers = {}
-        for question_id, user_answer in submission.answers.items():
-            # Find the question in the assessment
-            question = next((q for q in assessment["questions"] if q["id"] == question_id), None)
-            if question:
-                # Check if the answer is correct
-                is_correct = user_answer == question["correct_answer"]
-                checked_answers[question_id] = "correct" if is_correct else "incorrect"
-            else:
-                checked_answers[question_id] = "incorrect"
+        # Check answers against the precomputed answer key
+        grade = grade_submission(get_answer_key(assessment), submission.answers)
         
         try:
             # Analyze results
-            analysis = analyze_assessment_results(
+            analysis = await analyze_assessment_results(
                 submission.assessment_id,
-                checked_answers,
-                assessment["skills_tested"]
+                grade,
+                assessment["skills_tested"],
+                ai_improvement_plan=submission.ai_improvement_plan
             )
             
             if "error" in analysis:
@@ -688,13 +1045,8 @@ async def submit_assessment(submission: AssessmentSubmission):
             }
         except Exception as analysis_error:
             print(f"Error analyzing assessment: {analysis_error}")
-            # Calculate basic score for fallback
-            total_questions = len(checked_answers)
-            correct_answers = sum(1 for answer in checked_answers.values() if answer == "correct")
-            score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-            
             # Use structured analysis as fallback
-            analysis = create_structured_analysis(submission.assessment_id, score, assessment["skills_tested"])
+            analysis = create_structured_analysis(submission.assessment_id, grade["score"], assessment["skills_tested"], grade["skill_scores"])
             
             return {
                 "success": True,
@@ -706,6 +1058,43 @@ async def submit_assessment(submission: AssessmentSubmission):
         print(f"Error submitting assessment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/grade_assessments")
+async def grade_assessments(request: BulkGradeRequest):
+    """Grade many submissions at once (e.g. proctored batch exams) without LLM analysis"""
+    try:
+        assessment_ids = list({submission.assessment_id for submission in request.submissions})
+        assessments = await load_assessments(assessment_ids)
+        answer_keys = {assessment_id: get_answer_key(assessment) for assessment_id, assessment in assessments.items()}
+        
+        results = []
+        for submission in request.submissions:
+            answer_key = answer_keys.get(submission.assessment_id)
+            if answer_key is None:
+                results.append({
+                    "assessment_id": submission.assessment_id,
+                    "error": "Assessment not found"
+                })
+                continue
+            
+            grade = grade_submission(answer_key, submission.answers)
+            results.append({
+                "assessment_id": submission.assessment_id,
+                "score": grade["score"],
+                "correct_answers": grade["correct_answers"],
+                "total_questions": grade["total_questions"],
+                "skill_scores": grade["skill_scores"]
+            })
+        
+        return {
+            "success": True,
+            "results": results,
+            "message": f"Graded {len(results)} submissions"
+        }
+        
+    except Exception as e:
+        print(f"Error grading assessments: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/upload_skill_video")
 async def upload_skill_video(
     video: UploadFile = File(...),
@@ -750,10 +1139,28 @@ def health_check():
     return {
         "status": "healthy", 
         "service": "resume-skill-extractor-assessment",
-        "cohere_configured": cohere_client is not None
+        "cohere_configured": llm_gateway is not None,
+        "llm_gateway": llm_gateway.stats() if llm_gateway else None,
+        "assessment_cache": get_assessment_cache_stats() if assessment_cache_available else None,
+        "assessment_prewarm": assessment_prewarmer.stats() if assessment_prewarmer else None,
+        "resume_analysis_cache": resume_analysis_cache.stats(),
+        "login_event_buffer": login_event_buffer.stats() if login_event_buffer else None
     }
 
 # User management endpoints
+def valid_login_timestamp(timestamp: Optional[str]) -> str:
+    """The client's ISO-8601 login timestamp, or the server time if it is missing or unparseable
+    
+    Checked before the log is buffered, so one bad value can't fail a whole bulk insert.
+    """
+    if timestamp:
+        try:
+            datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            return timestamp
+        except ValueError:
+            print(f"⚠️ Ignoring invalid loginTimestamp {timestamp!r}, using server time")
+    return datetime.utcnow().isoformat()
+
 @app.post("/api/users/login", response_model=UserResponse)
 async def user_login(user_data: UserLoginRequest, request: Request):
     """Record user login and return user data with detailed tracking"""
@@ -777,35 +1184,27 @@ async def user_login(user_data: UserLoginRequest, request: Request):
                 "last_login": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
             }
             
-        # Check if user exists
-        user = get_user_by_email(user_data.email)
-        
-        if user:
-            # Update existing user login
-            update_user_login(user.id)
-        else:
-            # Create new user
-            user = create_user(user_data.dict())
-        
-        # Save detailed login tracking data
+        # Detailed login tracking data
         login_tracking_data = user_data.dict()
         login_tracking_data['ipAddress'] = client_ip
-        if not login_tracking_data.get('loginTimestamp'):
-            login_tracking_data['loginTimestamp'] = datetime.utcnow().isoformat()
+        login_tracking_data['loginTimestamp'] = valid_login_timestamp(login_tracking_data.get('loginTimestamp'))
         
-        save_login_log(login_tracking_data)
-        
-        # Update dashboard metrics
-        update_dashboard_metrics()
+        # Upsert user and bump metrics in one transaction; the login log is
+        # buffered and bulk-inserted in the background when the buffer is running
+        buffer_log = login_event_buffer is not None and login_event_buffer.running
+        user = await record_user_login(login_tracking_data, save_log=not buffer_log)
+        if buffer_log:
+            login_tracking_data['uid'] = user["id"]
+            await login_event_buffer.enqueue(login_tracking_data)
         
         # Return user data
         return {
-            "id": user.id,
-            "email": user.email,
-            "display_name": user.display_name,
-            "role": user.role,
-            "login_count": user.login_count,
-            "last_login": user.last_login.isoformat()
+            "id": user["id"],
+            "email": user["email"],
+            "display_name": user["display_name"],
+            "role": user["role"],
+            "login_count": user["login_count"],
+            "last_login": user["last_login"].isoformat()
         }
     except Exception as e:
         print(f"Error in user login: {e}")
@@ -837,7 +1236,7 @@ async def get_user_logins():
             # Return mock data if database is not available
             return []
             
-        users = get_all_users_with_login_data()
+        users = await get_all_users_with_login_data()
         return [
             {
                 "id": user.id,
@@ -870,25 +1269,41 @@ class LoginLogData(BaseModel):
     screen_resolution: Optional[str] = None
     timezone: Optional[str] = None
 
+def encode_login_log_cursor(log) -> str:
+    return f"{log.login_timestamp.isoformat()}|{log.id}"
+
+def decode_login_log_cursor(cursor: str):
+    timestamp, log_id = cursor.rsplit("|", 1)
+    return datetime.fromisoformat(timestamp), int(log_id)
+
 @app.get("/api/users/login-logs", response_model=List[LoginLogData])
-async def get_login_logs(limit: int = 100):
-    """Get detailed login logs for admin dashboard"""
+async def get_login_logs(response: Response, limit: int = 100, cursor: Optional[str] = None, user_id: Optional[str] = None):
+    """Get detailed login logs for admin dashboard
+    
+    Newest first. When more rows may follow, the X-Next-Cursor response header
+    holds the cursor to pass back for the next page.
+    """
+    try:
+        after = decode_login_log_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     try:
         if not database_available:
             # Return mock data if database is not available
             return []
-            
-        logs = get_user_login_logs(limit=limit)
-        result = []
         
-        for log in logs:
-            # Get user info for each log
-            user = get_user(log.user_id)
-            result.append({
+        logs = await get_login_logs_with_users(limit=limit, after=after, user_id=user_id)
+        
+        if logs and len(logs) == limit:
+            response.headers["X-Next-Cursor"] = encode_login_log_cursor(logs[-1])
+        
+        return [
+            {
                 "id": log.id,
                 "user_id": log.user_id,
-                "user_email": user.email if user else "Unknown",
-                "user_display_name": user.display_name if user else "Unknown",
+                "user_email": log.user_email or "Unknown",
+                "user_display_name": log.user_display_name if log.user_email else "Unknown",
                 "session_id": log.session_id,
                 "login_timestamp": log.login_timestamp.isoformat(),
                 "ip_address": log.ip_address,
@@ -898,17 +1313,127 @@ async def get_login_logs(limit: int = 100):
                 "language": log.language,
                 "screen_resolution": log.screen_resolution,
                 "timezone": log.timezone
-            })
-        
-        return result
+            }
+            for log in logs
+        ]
     except Exception as e:
         print(f"Error getting login logs: {e}")
         return []
 
+@app.get("/api/analytics/logins")
+async def get_login_analytics(granularity: str = "day", dimension: str = "all",
+                              start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Login counts per hour or day, broken down by browser, OS, platform, timezone or language
+    
+    Served from the pre-aggregated login_rollups table; defaults to the last 30 days.
+    """
+    if not database_available:
+        raise HTTPException(status_code=503, detail="Database not available")
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity must be 'hour' or 'day'")
+    if dimension not in ROLLUP_DIMENSIONS:
+        raise HTTPException(status_code=400, detail=f"dimension must be one of: {', '.join(ROLLUP_DIMENSIONS)}")
+    
+    start = start or datetime.utcnow() - timedelta(days=30)
+    rows = await get_login_rollups(granularity, dimension, start, end)
+    
+    totals = {}
+    for row in rows:
+        totals[row.value] = totals.get(row.value, 0) + row.login_count
+    
+    return {
+        "granularity": granularity,
+        "dimension": dimension,
+        "buckets": [
+            {"bucket_start": row.bucket_start.isoformat(), "value": row.value, "login_count": row.login_count}
+            for row in rows
+        ],
+        "totals": totals
+    }
+
+# Minimum seconds between login rollup rebuilds in a worker
+LOGIN_ROLLUP_REBUILD_INTERVAL_SECONDS = float(os.getenv("LOGIN_ROLLUP_REBUILD_INTERVAL_SECONDS", "3600"))
+
+login_rollup_rebuild_lock = asyncio.Lock()
+last_login_rollup_rebuild = None
+
+@app.post("/api/analytics/logins/rebuild")
+async def rebuild_login_analytics_endpoint():
+    """Reconcile the login rollups with the full login log table
+    
+    Runs one rebuild at a time and at most once per LOGIN_ROLLUP_REBUILD_INTERVAL_SECONDS.
+    """
+    global last_login_rollup_rebuild
+    if not database_available:
+        raise HTTPException(status_code=503, detail="Database not available")
+    if login_rollup_rebuild_lock.locked():
+        raise HTTPException(status_code=409, detail="A login analytics rebuild is already running")
+    if last_login_rollup_rebuild is not None:
+        wait = last_login_rollup_rebuild + LOGIN_ROLLUP_REBUILD_INTERVAL_SECONDS - time.monotonic()
+        if wait > 0:
+            raise HTTPException(status_code=429, detail="Login analytics were rebuilt recently",
+                                headers={"Retry-After": str(int(wait) + 1)})
+    
+    async with login_rollup_rebuild_lock:
+        last_login_rollup_rebuild = time.monotonic()
+        changed_rows = await asyncio.to_thread(rebuild_login_rollups, engine)
+    return {"success": True, "changed_rollup_rows": changed_rows}
+
+@app.get("/api/admin/export/{dataset}")
+async def export_dataset(dataset: str, format: str = "ndjson", start: Optional[datetime] = None,
+                         end: Optional[datetime] = None, cursor: Optional[str] = None, limit: Optional[int] = None):
+    """Stream users, login_logs or chat_interactions as NDJSON or CSV
+    
+    Rows come in sort-key order straight from a server-side cursor, so large
+    exports run in constant memory. start/end filter on the dataset's
+    timestamp; limit and cursor page through it.
+    """
+    if not database_available:
+        raise HTTPException(status_code=503, detail="Database not available")
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset (expected one of: {', '.join(EXPORT_DATASETS)})")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    try:
+        after = decode_export_cursor(dataset, cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"{dataset}_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{format}"
+    return StreamingResponse(
+        stream_export(dataset, format, start=start, end=end, after=after, limit=limit),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/api/admin/question-bank/import")
+async def import_question_bank(request: QuestionImportRequest):
+    """Add questions to the bank; invalid and already-banked questions are skipped"""
+    if not database_available:
+        raise HTTPException(status_code=503, detail="Database not available")
+    rows = []
+    for question in request.questions:
+        difficulty = question.get("difficulty") or request.difficulty
+        if difficulty not in DIFFICULTIES or not question.get("skill"):
+            continue
+        rows.extend(question_rows([question], question["skill"], difficulty, "import"))
+    try:
+        added = await add_bank_questions(rows)
+    except Exception as e:
+        print(f"Error importing questions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "received": len(request.questions),
+        "valid": len(rows),
+        "added": added
+    }
+
 @app.get("/api/users/{user_id}", response_model=UserResponse)
 async def get_user_data(user_id: str):
     """Get user data by ID"""
-    user = get_user(user_id)
+    user = await get_user(user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -924,9 +1449,8 @@ async def get_user_data(user_id: str):
 
 @app.get("/api/dashboard/metrics", response_model=DashboardMetricsResponse)
 async def get_metrics():
-    """Get dashboard metrics"""
-    # Update metrics before returning
-    metrics = update_dashboard_metrics()
+    """Get dashboard metrics (maintained incrementally, reconciled in the background)"""
+    metrics = await get_dashboard_metrics()
     
     if not metrics:
         raise HTTPException(status_code=500, detail="Failed to retrieve dashboard metrics")
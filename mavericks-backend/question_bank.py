@@ -0,0 +1,150 @@
+"""
+Question Bank
+Reusable assessment questions indexed by (skill, difficulty), collected from
+the predefined sets, LLM generations and admin imports. Assessments are
+assembled by sampling the bank, skipping questions a user has already seen;
+the LLM is only asked to top a skill up when its pool runs low.
+"""
+
+import hashlib
+import os
+import string
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+
+from database_models import BankQuestion, UserQuestionHistory
+from skill_registry import skill_registry
+
+# Unseen questions below which a skill's pool is topped up by the LLM
+QUESTION_BANK_MIN_POOL = int(os.getenv("QUESTION_BANK_MIN_POOL", "20"))
+
+# Questions requested from the LLM per top-up
+QUESTION_BANK_TOPUP_SIZE = int(os.getenv("QUESTION_BANK_TOPUP_SIZE", "10"))
+
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+
+
+def question_row(question: Dict, skill: str, difficulty: str, source: str) -> Optional[Dict]:
+    """Bank row for a question, or None if it can't be graded
+
+    Accepts a letter ('B') for correct_answer and stores the option it names.
+    """
+    text = str(question.get("question") or "").strip()
+    options = question.get("options")
+    answer = str(question.get("correct_answer") or "").strip()
+    if not text or not isinstance(options, list) or len(options) < 2:
+        return None
+    options = [str(option) for option in options]
+    if answer not in options and len(answer) == 1 and answer.upper() in string.ascii_uppercase[:len(options)]:
+        answer = options[string.ascii_uppercase.index(answer.upper())]
+    if answer not in options:
+        return None
+
+    skill = skill_registry.normalize(question.get("skill") or skill)
+    skill_key = skill_registry.cache_key(skill)
+    digest = hashlib.sha256("\x1f".join([skill_key, difficulty, text, *options]).encode()).hexdigest()
+    return {
+        "skill_key": skill_key,
+        "skill": skill,
+        "difficulty": difficulty,
+        "question": text,
+        "options": options,
+        "correct_answer": answer,
+        "explanation": str(question.get("explanation") or ""),
+        "source": source,
+        "content_hash": digest
+    }
+
+
+def question_rows(questions: Iterable[Dict], skill: str, difficulty: str, source: str) -> List[Dict]:
+    """Valid bank rows for questions, deduplicated by content"""
+    rows = {}
+    for question in questions:
+        row = question_row(question, skill, difficulty, source)
+        if row:
+            rows.setdefault(row["content_hash"], row)
+    return list(rows.values())
+
+
+def insert_questions(dialect_name: str):
+    """INSERT that skips questions already in the bank (SQLite and Postgres)"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(BankQuestion).on_conflict_do_nothing(index_elements=[BankQuestion.content_hash])
+
+
+def record_served(dialect_name: str):
+    """INSERT into the user's question history, ignoring questions already recorded"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(UserQuestionHistory).on_conflict_do_nothing(
+        index_elements=[UserQuestionHistory.user_id, UserQuestionHistory.question_id]
+    )
+
+
+def _unseen(query, user_id: Optional[str]):
+    if user_id:
+        seen = select(UserQuestionHistory.question_id).where(UserQuestionHistory.user_id == user_id)
+        query = query.where(BankQuestion.id.not_in(seen))
+    return query
+
+
+def sample_questions_query(skill: str, difficulty: str, count: int, user_id: Optional[str] = None):
+    """count random questions for a skill, excluding those user_id has been served"""
+    query = select(BankQuestion).where(
+        BankQuestion.skill_key == skill_registry.cache_key(skill),
+        BankQuestion.difficulty == difficulty
+    )
+    return _unseen(query, user_id).order_by(func.random()).limit(count)
+
+
+def unseen_count_query(skill: str, difficulty: str, user_id: Optional[str] = None):
+    """Size of a skill's pool, less what user_id has already been served"""
+    query = select(func.count(BankQuestion.id)).where(
+        BankQuestion.skill_key == skill_registry.cache_key(skill),
+        BankQuestion.difficulty == difficulty
+    )
+    return _unseen(query, user_id)
+
+
+def generated_question_rows(questions: Iterable[Dict], skills: List[str], difficulty: str,
+                            source: str = "llm") -> List[Dict]:
+    """Bank rows for an LLM assessment's questions, dropping ones for skills that weren't asked for"""
+    requested = {skill_registry.cache_key(skill): skill for skill in skills}
+    rows = []
+    for question in questions:
+        skill = requested.get(skill_registry.cache_key(question.get("skill") or ""))
+        if skill is None and len(skills) == 1:
+            skill = skills[0]
+        if skill is not None:
+            rows.extend(question_rows([dict(question, skill=skill)], skill, difficulty, source))
+    return rows
+
+
+def as_assessment_question(question: BankQuestion) -> Dict:
+    return {
+        "id": f"qb{question.id}",
+        "bank_id": question.id,
+        "skill": question.skill,
+        "question": question.question,
+        "options": list(question.options),
+        "correct_answer": question.correct_answer,
+        "explanation": question.explanation or ""
+    }
+
+
+def seed_question_rows() -> List[Dict]:
+    """Predefined assessment and starter questions, filed under intermediate"""
+    from assessment_cache import PREDEFINED_ASSESSMENTS, STARTER_QUESTIONS
+
+    rows = []
+    for skill, assessment in PREDEFINED_ASSESSMENTS.items():
+        rows.extend(question_rows(assessment["questions"], skill, "intermediate", "predefined"))
+    for skill, question in STARTER_QUESTIONS.items():
+        rows.extend(question_rows([question], skill, "intermediate", "predefined"))
+    return rows
@@ -0,0 +1,132 @@
+"""
+Incremental Question Parser
+Pulls complete question objects out of a streamed LLM assessment as soon as
+each one's closing brace arrives, so they can be shown before the rest of
+the completion exists, and so a truncated or malformed tail only loses the
+question it cuts through.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+QUESTIONS_ARRAY = re.compile(r'"questions"\s*:\s*\[')
+
+
+def is_complete_question(question) -> bool:
+    """Has the fields needed to show and grade it"""
+    return (
+        isinstance(question, dict)
+        and bool(str(question.get("question") or "").strip())
+        and isinstance(question.get("options"), list)
+        and len(question["options"]) >= 2
+        and bool(str(question.get("correct_answer") or "").strip())
+    )
+
+
+class QuestionStreamParser:
+    """Feed completion text in chunks; get back each question object once it is complete
+
+    Scans the "questions" array with a small string-aware bracket counter, so
+    nothing before the array and no partial object is ever handed to
+    json.loads. Objects that don't parse or lack required fields are counted
+    in skipped and dropped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0  # next unscanned character
+        self._in_array = False
+        self._done = False
+        self._depth = 0  # nesting inside the array
+        self._object_start = None
+        self._in_string = False
+        self._escaped = False
+        self.emitted = 0
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        self._buffer += chunk
+        questions = []
+        if self._done:
+            return questions
+        if not self._in_array:
+            match = QUESTIONS_ARRAY.search(self._buffer)
+            if not match:
+                return questions
+            self._in_array = True
+            self._pos = match.end()
+
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0 and char == "{":
+                    self._object_start = pos
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # End of the questions array
+                    self._done = True
+                    pos += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    question = self._parse(buffer[self._object_start:pos + 1])
+                    if question is not None:
+                        questions.append(question)
+                    self._object_start = None
+            pos += 1
+        self._pos = pos
+        return questions
+
+    @property
+    def complete(self) -> bool:
+        """Whether the questions array was closed, i.e. nothing was cut off"""
+        return self._done
+
+    def _parse(self, text: str) -> Optional[Dict]:
+        try:
+            question = json.loads(text)
+        except json.JSONDecodeError:
+            question = None
+        if not is_complete_question(question):
+            self.skipped += 1
+            return None
+        self.emitted += 1
+        return question
+
+    def finish(self) -> List[Dict]:
+        """Questions recoverable once the stream ends without a "questions" array
+
+        Falls back to parsing the whole completion, for models that answer
+        with a bare list of questions.
+        """
+        if self._in_array:
+            return []
+        text = self._buffer.strip()
+        start = min((index for index in (text.find("["), text.find("{")) if index != -1), default=-1)
+        if start == -1:
+            return []
+        try:
+            parsed = json.loads(text[start:max(text.rfind("]"), text.rfind("}")) + 1])
+        except json.JSONDecodeError:
+            return []
+        candidates = parsed.get("questions", []) if isinstance(parsed, dict) else parsed
+        if not isinstance(candidates, list):
+            return []
+        self._done = True
+        questions = [question for question in candidates if is_complete_question(question)]
+        self.emitted += len(questions)
+        self.skipped += len(candidates) - len(questions)
+        return questions
@@ -0,0 +1,264 @@
+"""
+Resume Parser
+Text extraction for uploaded resumes. PDFs are parsed page by page in a
+process pool under page, size and CPU-time budgets so a pathological file
+can't starve other requests.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import signal
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import PyPDF2
+
+from skill_matcher import skill_matcher
+
+# Largest upload accepted, in bytes
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Pages read from a PDF before stopping
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "30"))
+
+# Stop reading pages once this much text has been extracted
+RESUME_MAX_TEXT_CHARS = int(os.getenv("RESUME_MAX_TEXT_CHARS", "100000"))
+
+# CPU seconds a single PDF may use in a worker
+RESUME_PARSE_CPU_SECONDS = float(os.getenv("RESUME_PARSE_CPU_SECONDS", "10"))
+
+# Largest zip archive or multipart batch accepted by batch ingestion, in bytes
+RESUME_BATCH_MAX_BYTES = int(os.getenv("RESUME_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Most resumes accepted in one batch
+RESUME_BATCH_MAX_FILES = int(os.getenv("RESUME_BATCH_MAX_FILES", "500"))
+
+# Number of PDF parsing worker processes
+RESUME_PARSER_WORKERS = int(os.getenv("RESUME_PARSER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# How parser workers are started; never fork, which would copy the server's
+# threads, sockets and connection pools into the workers
+RESUME_PARSER_START_METHOD = os.getenv(
+    "RESUME_PARSER_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Wall-clock seconds a parse may take once a worker has picked it up
+RESUME_PARSE_WALL_SECONDS = float(os.getenv("RESUME_PARSE_WALL_SECONDS", str(RESUME_PARSE_CPU_SECONDS * 2)))
+
+
+class ResumeParseTimeout(BaseException):
+    """Raised inside a worker when a document exceeds its CPU budget
+
+    Derives from BaseException so broad ``except Exception`` blocks inside the
+    PDF library can't swallow it.
+    """
+
+
+def iter_pdf_pages(pdf_content: bytes, max_pages: int = RESUME_MAX_PAGES) -> Iterator[str]:
+    """Yield the text of each page, parsing pages lazily up to max_pages"""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+    for index in range(min(len(pdf_reader.pages), max_pages)):
+        yield pdf_reader.pages[index].extract_text() or ""
+
+
+def extract_text_from_pdf(pdf_content, max_pages: int = RESUME_MAX_PAGES,
+                          max_chars: int = RESUME_MAX_TEXT_CHARS):
+    """Extract text from PDF content, stopping early at the page or text budget"""
+    parts = []
+    length = 0
+    try:
+        for page_text in iter_pdf_pages(pdf_content, max_pages):
+            parts.append(page_text)
+            length += len(page_text) + 1
+            if length >= max_chars:
+                break
+    except ResumeParseTimeout:
+        _stop_cpu_timer()
+        print(f"⚠️ PDF parsing hit the CPU budget after {len(parts)} pages, keeping partial text")
+    except Exception as e:
+        print(f"Error extracting PDF text: {e}")
+        if not parts:
+            return ""
+    return "\n".join(parts) + "\n" if parts else ""
+
+
+def extract_text_from_txt(content):
+    """Extract text from TXT content"""
+    try:
+        return content.decode("utf-8", errors="ignore")
+    except Exception as e:
+        print(f"Error extracting TXT text: {e}")
+        return ""
+
+
+def _raise_parse_timeout(signum, frame):
+    raise ResumeParseTimeout()
+
+
+def _stop_cpu_timer():
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+
+
+def _extract_pdf_in_worker(pdf_content: bytes, cpu_seconds: float) -> str:
+    """Worker entry point: extract text under a CPU-time limit"""
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGVTALRM, _raise_parse_timeout)
+        # Keep re-firing every 50ms in case the first signal lands somewhere unhelpful
+        signal.setitimer(signal.ITIMER_VIRTUAL, cpu_seconds, 0.05)
+    try:
+        return extract_text_from_pdf(pdf_content)
+    except ResumeParseTimeout:
+        return ""
+    finally:
+        _stop_cpu_timer()
+
+
+def _analyze_resume_in_worker(content: bytes, filename: str, cpu_seconds: float) -> Dict:
+    """Worker entry point for batch ingestion: extract text and skills"""
+    if filename.lower().endswith('.pdf'):
+        text = _extract_pdf_in_worker(content, cpu_seconds)
+    else:
+        text = extract_text_from_txt(content)
+    if not text.strip():
+        return {"error": "Could not extract text from the uploaded file"}
+    return {"skills": skill_matcher.find_skills(text), "text_length": len(text)}
+
+
+class ResumeBatchTooLarge(ValueError):
+    """A batch archive holds more resumes or more uncompressed bytes than allowed"""
+
+
+def iter_zip_resumes(archive: bytes, max_files: int = RESUME_BATCH_MAX_FILES,
+                     max_bytes: int = RESUME_BATCH_MAX_BYTES) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """Yield (filename, content, error) for each resume in a zip archive
+
+    Sizes are checked from the zip directory before anything is decompressed:
+    each entry against RESUME_MAX_BYTES, and the running totals against
+    max_files entries and max_bytes uncompressed bytes, raising
+    ResumeBatchTooLarge as soon as either is exceeded (zip bombs).
+    """
+    files = 0
+    total_bytes = 0
+    with zipfile.ZipFile(io.BytesIO(archive)) as bundle:
+        for info in bundle.infolist():
+            if info.is_dir() or os.path.basename(info.filename).startswith('.'):
+                continue
+            files += 1
+            if files > max_files:
+                raise ResumeBatchTooLarge(f"Batch has more than {RESUME_BATCH_MAX_FILES} resumes")
+            if not info.filename.lower().endswith(('.pdf', '.txt')):
+                yield info.filename, None, "Unsupported file type (expected .pdf or .txt)"
+            elif info.file_size > RESUME_MAX_BYTES:
+                yield info.filename, None, f"Resume is larger than the {RESUME_MAX_BYTES // (1024 * 1024)}MB limit"
+            else:
+                total_bytes += info.file_size
+                if total_bytes > max_bytes:
+                    raise ResumeBatchTooLarge(
+                        f"Batch is larger than the {RESUME_BATCH_MAX_BYTES // (1024 * 1024)}MB limit uncompressed"
+                    )
+                # ZipExtFile never returns more than the declared file_size
+                yield info.filename, bundle.read(info), None
+
+
+_parser_pool: Optional[ProcessPoolExecutor] = None
+_parser_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_parser_pool() -> ProcessPoolExecutor:
+    global _parser_pool
+    if _parser_pool is None:
+        _parser_pool = ProcessPoolExecutor(
+            max_workers=RESUME_PARSER_WORKERS,
+            mp_context=multiprocessing.get_context(RESUME_PARSER_START_METHOD)
+        )
+    return _parser_pool
+
+
+def _get_parser_slots() -> asyncio.Semaphore:
+    # Created lazily so it binds to the running event loop
+    global _parser_slots
+    if _parser_slots is None:
+        _parser_slots = asyncio.Semaphore(RESUME_PARSER_WORKERS)
+    return _parser_slots
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor):
+    """Drop a pool whose worker died so the next job gets a fresh one"""
+    global _parser_pool
+    if _parser_pool is pool:
+        _parser_pool = None
+        print("⚠️ A resume parser worker died, restarting the pool")
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parser_pool():
+    global _parser_pool, _parser_slots
+    if _parser_pool is not None:
+        _parser_pool.shutdown(wait=False, cancel_futures=True)
+        _parser_pool = None
+    _parser_slots = None
+
+
+async def run_in_parser_pool(func: Callable, *args):
+    """Run func(*args) in the parser pool, once a worker is free
+
+    Jobs wait for one of RESUME_PARSER_WORKERS slots before being submitted,
+    so RESUME_PARSE_WALL_SECONDS covers the parse itself rather than time
+    queued behind a batch. A slot is held until its worker is really done,
+    even after a timeout. If a worker dies the pool is replaced and the job
+    retried once.
+
+    Raises asyncio.TimeoutError, or BrokenProcessPool if the retry dies too.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _get_parser_slots()
+    for attempt in range(2):
+        await slots.acquire()
+        pool = get_parser_pool()
+        try:
+            future = pool.submit(func, *args)
+        except BaseException as e:
+            slots.release()
+            if not isinstance(e, BrokenProcessPool) or attempt:
+                raise
+            _discard_broken_pool(pool)
+            continue
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(slots.release))
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), RESUME_PARSE_WALL_SECONDS)
+        except BrokenProcessPool:
+            _discard_broken_pool(pool)
+            if attempt:
+                raise
+
+
+async def extract_resume_text(content: bytes, filename: str) -> str:
+    """Extract text from an uploaded resume without blocking the event loop"""
+    if not filename.lower().endswith('.pdf'):
+        return extract_text_from_txt(content)
+
+    try:
+        # Wall-clock guard on top of the worker's CPU budget
+        return await run_in_parser_pool(_extract_pdf_in_worker, content, RESUME_PARSE_CPU_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"⚠️ PDF parsing timed out for {filename}")
+        return ""
+    except BrokenProcessPool:
+        print(f"⚠️ PDF parser worker crashed on {filename}")
+        return ""
+
+
+async def analyze_resume_in_pool(content: bytes, filename: str) -> Dict:
+    """Extract text and skills for one batch item in the process pool"""
+    try:
+        return await run_in_parser_pool(_analyze_resume_in_worker, content, filename, RESUME_PARSE_CPU_SECONDS)
+    except asyncio.TimeoutError:
+        return {"error": "Timed out extracting text"}
+    except BrokenProcessPool:
+        return {"error": "Text extraction crashed"}
@@ -0,0 +1,163 @@
+"""
+Skill Matcher Engine
+Compiles the whole skill vocabulary once into a single trie-shaped regex and
+extracts skills from resume text in one pass
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Technical skill vocabulary grouped by category
+SKILL_PATTERNS = {
+    'programming_languages': [
+        'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
+        'kotlin', 'typescript', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash', 'powershell',
+        'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server'
+    ],
+    'web_technologies': [
+        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
+        'spring', 'laravel', 'bootstrap', 'jquery', 'sass', 'less', 'webpack', 'babel',
+        'reactjs', 'react.js', 'nodejs', 'node.js'
+    ],
+    'databases': [
+        'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server',
+        'elasticsearch', 'cassandra', 'dynamodb', 'firebase', 'sql'
+    ],
+    'cloud_devops': [
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab',
+        'terraform', 'ansible', 'chef', 'puppet', 'nagios', 'prometheus', 'grafana'
+    ],
+    'data_ai': [
+        'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn',
+        'pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter', 'tableau', 'power bi'
+    ],
+    'mobile': [
+        'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic'
+    ]
+}
+
+# Display names for terms that don't follow str.title() capitalization
+SKILL_ALIASES = {
+    'c++': 'C++',
+    'c#': 'C#',
+    'php': 'PHP',
+    'typescript': 'TypeScript',
+    'matlab': 'MATLAB',
+    'powershell': 'PowerShell',
+    'node.js': 'Node.js',
+    'nodejs': 'Node.js',
+    'machine learning': 'Machine Learning',
+    'deep learning': 'Deep Learning',
+    'sql': 'SQL',
+    'mysql': 'MySQL',
+    'postgresql': 'PostgreSQL',
+    'mongodb': 'MongoDB',
+    'sqlite': 'SQLite',
+    'sql server': 'SQL Server',
+    'dynamodb': 'DynamoDB',
+    'javascript': 'JavaScript',
+    'html': 'HTML',
+    'css': 'CSS',
+    'jquery': 'jQuery',
+    'react': 'React',
+    'reactjs': 'React',
+    'react.js': 'React',
+    'aws': 'AWS',
+    'gcp': 'GCP',
+    'github': 'GitHub',
+    'gitlab': 'GitLab',
+    'tensorflow': 'TensorFlow',
+    'pytorch': 'PyTorch',
+    'scikit-learn': 'scikit-learn',
+    'numpy': 'NumPy',
+    'power bi': 'Power BI',
+    'ios': 'iOS'
+}
+
+
+def _build_trie(terms: Iterable[str]) -> Dict:
+    """Build a character trie; the '' key marks the end of a term"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return trie
+
+
+def _trie_to_regex(node: Dict) -> str:
+    """Turn a trie into a regex where every branch point is a single alternation"""
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char != ''
+    ]
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # Greedy optional group: prefer the longer term, fall back to the shorter one
+        return '(?:' + body + ')?'
+    return body
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """Single-pass matcher mapping vocabulary hits to canonical skill names"""
+
+    def __init__(self, vocabulary: Dict[str, List[str]], aliases: Optional[Dict[str, str]] = None):
+        aliases = {term.lower(): name for term, name in (aliases or {}).items()}
+
+        # term -> canonical display name
+        canonical = {}
+        for skills in vocabulary.values():
+            for skill in skills:
+                term = skill.lower()
+                canonical[term] = aliases.get(term, skill.title())
+        self.canonical = canonical
+
+        # term -> every canonical skill the term implies. A compound term such as
+        # 'react native' or 'sql server' also counts as its shorter terms
+        # ('React', 'SQL') because the single-pass scan never overlaps matches.
+        self.alias_table = {term: self._implied_skills(term) for term in canonical}
+
+        # Changes whenever the vocabulary or canonical names change; used to
+        # invalidate cached extraction results
+        self.version = hashlib.sha256(
+            json.dumps(self.alias_table, sort_keys=True).encode()
+        ).hexdigest()[:12]
+
+        trie_regex = _trie_to_regex(_build_trie(canonical))
+        self.pattern = re.compile(r'(?<!\w)' + trie_regex + r'(?!\w)') if trie_regex else None
+
+    def _implied_skills(self, term: str) -> Tuple[str, ...]:
+        starts = [i for i in range(len(term)) if i == 0 or not _is_word_char(term[i - 1])]
+        ends = [j for j in range(1, len(term) + 1) if j == len(term) or not _is_word_char(term[j])]
+        implied = {self.canonical[term]}
+        for i in starts:
+            for j in ends:
+                if j > i and term[i:j] in self.canonical:
+                    implied.add(self.canonical[term[i:j]])
+        return tuple(sorted(implied))
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return the sorted canonical skills mentioned in text"""
+        if not text or self.pattern is None:
+            return []
+
+        found_skills = set()
+        alias_table = self.alias_table
+        for match in self.pattern.finditer(text.lower()):
+            found_skills.update(alias_table[match.group(0)])
+        return sorted(found_skills)
+
+
+# Compiled once at import and shared by every request
+skill_matcher = SkillMatcher(SKILL_PATTERNS, SKILL_ALIASES)
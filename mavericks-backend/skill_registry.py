@@ -0,0 +1,143 @@
+"""
+Skill Registry
+One canonical name for every way a skill gets spelled. Built once at import
+from the skill matcher's vocabulary plus lookup-only aliases, and shared by
+extraction, assessment cache keys, predefined question banks and video
+recommendations.
+"""
+
+import difflib
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from skill_matcher import SKILL_PATTERNS, SkillMatcher, skill_matcher
+
+# Spellings accepted when looking a skill up, but not scanned for in resume
+# text (too short or ambiguous to match reliably in free text)
+SKILL_LOOKUP_ALIASES = {
+    'js': 'JavaScript',
+    'es6': 'JavaScript',
+    'ts': 'TypeScript',
+    'py': 'Python',
+    'python3': 'Python',
+    'golang': 'Go',
+    'postgres': 'PostgreSQL',
+    'psql': 'PostgreSQL',
+    'mongo': 'MongoDB',
+    'mssql': 'SQL Server',
+    'node': 'Node.js',
+    'k8s': 'Kubernetes',
+    'ml': 'Machine Learning',
+    'dl': 'Deep Learning',
+    'sklearn': 'scikit-learn',
+    'tf': 'TensorFlow',
+    'amazon web services': 'AWS',
+    'google cloud': 'GCP',
+    'google cloud platform': 'GCP',
+    'vuejs': 'Vue',
+    'angularjs': 'Angular'
+}
+
+# Skills served by a broader skill's question bank or videos when they have none of their own
+SKILL_PARENTS = {
+    'MySQL': 'SQL',
+    'PostgreSQL': 'SQL',
+    'SQLite': 'SQL',
+    'SQL Server': 'SQL'
+}
+
+# Minimum similarity for a spelling suggestion; suggestions are never used as
+# canonical names, since near-misses are often different skills (Preact, Vuex)
+SUGGESTION_CUTOFF = 0.85
+
+
+def normalize_key(name: str) -> str:
+    """Lookup key: lowercase with spaces, dots, dashes and underscores removed"""
+    return re.sub(r'[\s._\-]+', '', name.lower())
+
+
+class SkillRegistry:
+    """Canonical skill names, categories and parents with O(1) alias lookups"""
+
+    def __init__(self, matcher: SkillMatcher, categories: Dict[str, List[str]],
+                 lookup_aliases: Optional[Dict[str, str]] = None,
+                 parents: Optional[Dict[str, str]] = None):
+        self.parents = dict(parents or {})
+
+        # normalized spelling -> canonical name
+        by_key = {}
+        for term, name in matcher.canonical.items():
+            by_key.setdefault(normalize_key(term), name)
+            by_key.setdefault(normalize_key(name), name)
+        for alias, name in (lookup_aliases or {}).items():
+            by_key.setdefault(normalize_key(alias), name)
+        self._by_key = by_key
+        self._keys = sorted(by_key)
+
+        # canonical name -> categories it is listed under
+        skill_categories = {}
+        for category, terms in categories.items():
+            for term in terms:
+                listed = skill_categories.setdefault(matcher.canonical[term.lower()], [])
+                if category not in listed:
+                    listed.append(category)
+        self._categories = {name: tuple(listed) for name, listed in skill_categories.items()}
+
+        self._suggest = lru_cache(maxsize=4096)(self._closest_match)
+
+    def _closest_match(self, key: str) -> Optional[str]:
+        # Short keys are too ambiguous to guess at
+        if len(key) < 4:
+            return None
+        matches = difflib.get_close_matches(key, self._keys, n=1, cutoff=SUGGESTION_CUTOFF)
+        return self._by_key[matches[0]] if matches else None
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical name for any known spelling ('Postgres', 'React JS'), else None"""
+        if not name:
+            return None
+        key = normalize_key(name)
+        found = self._by_key.get(key)
+        if found is None and key.endswith('js') and len(key) > 2:
+            # 'Vue JS', 'Express.js' and friends
+            found = self._by_key.get(key[:-2])
+        return found
+
+    def suggest(self, name: str) -> Optional[str]:
+        """Closest known skill for a misspelling ('Pyhton'), for "did you mean" hints only"""
+        if not name:
+            return None
+        return self.canonical(name) or self._suggest(normalize_key(name))
+
+    def normalize(self, name: str) -> str:
+        """Canonical name, or the trimmed input for skills the registry doesn't know"""
+        return self.canonical(name) or ' '.join(name.split())
+
+    def normalize_skills(self, names: Iterable[str]) -> List[str]:
+        """Normalize a skill list, dropping blanks and duplicates and keeping order"""
+        normalized = []
+        for name in names:
+            skill = self.normalize(name) if name else ''
+            if skill and skill not in normalized:
+                normalized.append(skill)
+        return normalized
+
+    def cache_key(self, name: str) -> str:
+        """Key under which equivalent spellings of a skill share cache entries"""
+        return normalize_key(self.normalize(name))
+
+    def categories(self, name: str) -> Tuple[str, ...]:
+        return self._categories.get(self.canonical(name), ())
+
+    def lookup(self, table: Dict[str, object], name: str):
+        """Entry for a skill in a table keyed by canonical names, falling back to its parent skill"""
+        skill = self.canonical(name) or name
+        if skill in table:
+            return table[skill]
+        parent = self.parents.get(skill)
+        return table.get(parent) if parent else None
+
+
+# Built once at import and shared by every module
+skill_registry = SkillRegistry(skill_matcher, SKILL_PATTERNS, SKILL_LOOKUP_ALIASES, SKILL_PARENTS)
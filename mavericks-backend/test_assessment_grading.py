@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Checks for answer grading: the precomputed answer key, single-pass
+grading with per-skill scores and per-skill weak-skill detection. Works as a script or under pytest.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from assessment_grading import build_answer_key, get_answer_key, grade_submission, find_weak_skills, skill_score
+
+ASSESSMENT = {
+    "questions": [
+        {"id": "q1", "question": "?", "correct_answer": "A", "skill": "Python"},
+        {"id": "q2", "question": "?", "correct_answer": "B", "skill": "Python"},
+        {"id": "q3", "question": "?", "correct_answer": "C", "skill": "SQL"},
+        {"id": "q4", "question": "?", "correct_answer": "D"}
+    ]
+}
+
+
+def test_answer_key_indexes_questions():
+    key = build_answer_key(ASSESSMENT)
+    assert key["q3"] == {"correct_answer": "C", "skill": "SQL"}
+    assert key["q4"] == {"correct_answer": "D", "skill": None}
+    # A stored key wins over rebuilding one
+    assert get_answer_key({**ASSESSMENT, "answer_key": {"q1": key["q1"]}}) == {"q1": key["q1"]}
+    assert get_answer_key(ASSESSMENT) == key
+
+
+def test_grades_in_one_pass():
+    result = grade_submission(build_answer_key(ASSESSMENT), {"q1": "A", "q2": "X", "q3": "C", "q4": "D"})
+    assert (result["correct_answers"], result["total_questions"], result["score"]) == (3, 4, 75.0)
+    assert result["checked_answers"] == {"q1": "correct", "q2": "incorrect", "q3": "correct", "q4": "correct"}
+    # Questions without a skill only count toward the overall score
+    assert result["skill_scores"] == {
+        "Python": {"correct": 1, "total": 2, "score": 50.0},
+        "SQL": {"correct": 1, "total": 1, "score": 100.0}
+    }
+
+
+def test_unknown_and_missing_answers():
+    key = build_answer_key(ASSESSMENT)
+    result = grade_submission(key, {"q1": "A", "nope": "A"})
+    assert result["checked_answers"]["nope"] == "incorrect"
+    assert (result["correct_answers"], result["total_questions"], result["score"]) == (1, 2, 50.0)
+    assert result["skill_scores"] == {"Python": {"correct": 1, "total": 1, "score": 100.0}}
+
+    empty = grade_submission(key, {})
+    assert (empty["score"], empty["skill_scores"]) == (0, {})
+
+
+def test_weak_skills_judged_per_skill():
+    result = grade_submission(build_answer_key(ASSESSMENT), {"q1": "X", "q2": "X", "q3": "C", "q4": "D"})
+    assert result["score"] == 50.0
+    # Python is weak on its own questions even though the overall score passes
+    assert find_weak_skills(["Python", "SQL"], result["skill_scores"], result["score"]) == ["Python"]
+
+
+def test_unanswered_skills_fall_back_to_overall_score():
+    skill_scores = {"SQL": {"correct": 0, "total": 1, "score": 0.0}}
+    assert skill_score("Rust", skill_scores, 30.0) == 30.0
+    # Requested skills first, then graded skills nobody asked for
+    assert find_weak_skills(["Rust", "Go"], skill_scores, 30.0) == ["Rust", "Go", "SQL"]
+    assert find_weak_skills(["Rust"], skill_scores, 40.0) == ["SQL"]
+    assert find_weak_skills(["Rust"], skill_scores, 40.0, threshold=50) == ["Rust", "SQL"]
+
+
+if __name__ == "__main__":
+    for check in (test_answer_key_indexes_questions, test_grades_in_one_pass, test_unknown_and_missing_answers,
+                  test_weak_skills_judged_per_skill, test_unanswered_skills_fall_back_to_overall_score):
+        check()
+        print(f"✅ {check.__name__}")
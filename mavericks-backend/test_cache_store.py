@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Checks for the bounded cache: LRU eviction order, TTL expiry and the
+hit/miss/eviction/expiration counters, against the in-memory and SQLite
+backends. Works as a script or under pytest.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_store import BoundedCache, MemoryCacheBackend, SQLiteCacheBackend
+
+_cache_dir = tempfile.mkdtemp(prefix="mavericks-cache-check-")
+
+
+def caches(max_size, ttl):
+    """One cache per backend; each SQLite cache gets its own namespace"""
+    namespace = f"check_{time.monotonic_ns()}"
+    return [
+        BoundedCache(MemoryCacheBackend(max_size), ttl),
+        BoundedCache(SQLiteCacheBackend(max_size, namespace, os.path.join(_cache_dir, "cache.db")), ttl),
+    ]
+
+
+def tick():
+    # Keeps SQLite's accessed_at timestamps strictly increasing
+    time.sleep(0.002)
+
+
+def test_evicts_least_recently_used():
+    for cache in caches(max_size=3, ttl=60):
+        for key in ("a", "b", "c"):
+            cache.set(key, {"key": key})
+            tick()
+        # Reading "a" makes "b" the least recently used
+        assert cache.get("a") == {"key": "a"}
+        tick()
+        cache.set("d", {"key": "d"})
+        tick()
+        assert cache.peek("b") is None, type(cache.backend).__name__
+        for key in ("c", "a", "d"):
+            # Reads refresh recency too, leaving "c" the oldest
+            assert cache.peek(key) == {"key": key}
+            tick()
+
+        cache.set("e", {"key": "e"})
+        assert cache.peek("c") is None
+        assert cache.stats()["evictions"] == 2
+        assert cache.stats()["size"] == 3
+
+
+def test_entries_expire_after_ttl():
+    for cache in caches(max_size=10, ttl=0.05):
+        cache.set("short", {"v": 1})
+        cache.set("long", {"v": 2}, ttl=60)
+        assert cache.get("short") == {"v": 1}
+        time.sleep(0.1)
+        assert cache.get("short") is None
+        assert cache.get("long") == {"v": 2}
+
+
+def test_counters_and_sweep():
+    for cache in caches(max_size=10, ttl=0.05):
+        for key in ("a", "b", "c"):
+            cache.set(key, {"key": key})
+        cache.set("kept", {"key": "kept"}, ttl=60)
+        cache.get("a")
+        cache.get("missing")
+        cache.peek("missing")  # not counted
+        time.sleep(0.1)
+
+        assert cache.sweep() == 3
+        assert cache.sweep() == 0
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 3, 1)
+        assert stats["hit_rate"] == 0.5
+
+
+if __name__ == "__main__":
+    for check in (test_evicts_least_recently_used, test_entries_expire_after_ttl, test_counters_and_sweep):
+        check()
+        print(f"✅ {check.__name__}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Checks for the login event buffer: batches flush when full, when the oldest
+event reaches the flush interval, and on stop(); writer failures count as
+dropped events. Works as a script or under pytest.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from login_events import LoginEventBuffer
+
+
+class RecordingWriter:
+    """Stands in for save_login_logs_bulk, keeping each batch it is handed"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, batch):
+        if self.fail:
+            raise RuntimeError("database down")
+        self.batches.append([event["n"] for event in batch])
+        return len(batch)
+
+
+def events(start, count):
+    return [{"n": n} for n in range(start, start + count)]
+
+
+def test_flushes_full_batches():
+    async def scenario():
+        writer = RecordingWriter()
+        buffer = LoginEventBuffer(writer, flush_size=3, flush_interval_ms=60_000)
+        buffer.start()
+        for event in events(0, 7):
+            await buffer.enqueue(event)
+        # Two full batches go out without waiting for the interval
+        for _ in range(100):
+            if len(writer.batches) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert writer.batches == [[0, 1, 2], [3, 4, 5]]
+        await buffer.stop()
+        return writer, buffer
+
+    writer, buffer = asyncio.run(scenario())
+    assert writer.batches[-1] == [6]
+    assert buffer.stats()["events_written"] == 7
+
+
+def test_flushes_after_interval():
+    async def scenario():
+        writer = RecordingWriter()
+        buffer = LoginEventBuffer(writer, flush_size=100, flush_interval_ms=50)
+        buffer.start()
+        for event in events(0, 2):
+            await buffer.enqueue(event)
+        await asyncio.sleep(0.02)
+        assert writer.batches == []
+        await asyncio.sleep(0.1)
+        assert writer.batches == [[0, 1]]
+        await buffer.stop()
+        return buffer
+
+    assert asyncio.run(scenario()).stats()["batches_written"] == 1
+
+
+def test_stop_writes_everything_queued():
+    async def scenario():
+        writer = RecordingWriter()
+        buffer = LoginEventBuffer(writer, flush_size=100, flush_interval_ms=60_000)
+        buffer.start()
+        for event in events(0, 5):
+            await buffer.enqueue(event)
+        await buffer.stop()
+        assert not buffer.running
+        return writer, buffer
+
+    writer, buffer = asyncio.run(scenario())
+    assert writer.batches == [[0, 1, 2, 3, 4]]
+    assert buffer.stats() == {"queued": 0, "events_written": 5, "events_dropped": 0, "batches_written": 1}
+
+
+def test_failed_writes_count_as_dropped():
+    async def scenario():
+        buffer = LoginEventBuffer(RecordingWriter(fail=True), flush_size=100, flush_interval_ms=60_000)
+        buffer.start()
+        for event in events(0, 3):
+            await buffer.enqueue(event)
+        await buffer.stop()
+        return buffer
+
+    stats = asyncio.run(scenario()).stats()
+    assert (stats["events_written"], stats["events_dropped"], stats["batches_written"]) == (0, 3, 0)
+
+
+if __name__ == "__main__":
+    for check in (test_flushes_full_batches, test_flushes_after_interval, test_stop_writes_everything_queued,
+                  test_failed_writes_count_as_dropped):
+        check()
+        print(f"✅ {check.__name__}")
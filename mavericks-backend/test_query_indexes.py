@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Check that the filtered/sorted queries in database_utils are served by an index
+
+Runs every query against a throwaway SQLite database, captures the SQL and
+asks SQLite for its EXPLAIN QUERY PLAN. A plan that scans a whole table or
+sorts through a temporary B-tree fails the check. Works as a script or
+under pytest.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Point the models at a scratch database before anything imports them
+_db_dir = tempfile.mkdtemp(prefix="mavericks-index-check-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'index_check.db')}"
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+import database_utils as db
+from database_models import engine, init_db
+
+# Queries that read a whole table on purpose (admin listings, single-row metrics)
+FULL_SCAN_ALLOWED = {
+    "get_all_users_with_login_data",
+    "update_dashboard_metrics",
+    "get_dashboard_metrics",
+}
+
+
+def login(uid):
+    return {
+        "uid": uid, "email": f"{uid}@example.com", "displayName": uid,
+        "loginTimestamp": datetime.utcnow().isoformat() + "Z", "deviceInfo": {"browser": "Chrome"}
+    }
+
+
+def seed():
+    db.record_user_login(login("u1"))
+    db.record_user_login(login("u2"))
+    db.save_assessment({
+        "assessment_id": "a1", "user_id": "u1", "title": "Python", "skills": ["Python"],
+        "difficulty": "intermediate", "score": 80.0
+    })
+    db.save_assessment_session({"assessment_id": "s1", "questions": []}, ttl_seconds=3600)
+    db.save_chat_interaction("u1", "hello", "hi")
+    now = datetime.utcnow()
+    db.create_hackathon({
+        "title": "Hack", "description": "", "start_date": now, "end_date": now + timedelta(days=1),
+        "status": "upcoming", "skill_level": "beginner", "technologies": []
+    })
+    return db.get_hackathons(status="upcoming")[0].id
+
+
+def workload(hackathon_id):
+    """(name, call) pairs covering the query shapes used by the API"""
+    now = datetime.utcnow()
+    return [
+        ("get_user", lambda: db.get_user("u1")),
+        ("get_user_by_email", lambda: db.get_user_by_email("u1@example.com")),
+        ("get_all_users_with_login_data", db.get_all_users_with_login_data),
+        ("record_user_login", lambda: db.record_user_login(login("u1"))),
+        ("get_user_login_logs", lambda: db.get_user_login_logs(user_id="u1")),
+        ("get_user_login_logs_all", lambda: db.get_user_login_logs()),
+        ("get_login_logs_with_users", lambda: db.get_login_logs_with_users()),
+        ("get_login_logs_with_users_after", lambda: db.get_login_logs_with_users(after=(now, 10))),
+        ("get_login_logs_with_users_user", lambda: db.get_login_logs_with_users(user_id="u1", after=(now, 10))),
+        ("get_recent_login_activity", db.get_recent_login_activity),
+        ("get_user_assessments", lambda: db.get_user_assessments("u1")),
+        ("get_assessment_session", lambda: db.get_assessment_session("s1")),
+        ("get_assessment_sessions", lambda: db.get_assessment_sessions(["s1", "s2"])),
+        ("delete_expired_assessment_sessions", db.delete_expired_assessment_sessions),
+        ("get_chat_interactions", lambda: db.get_chat_interactions(user_id="u1", start_date=now - timedelta(days=7))),
+        ("get_chat_interactions_range", lambda: db.get_chat_interactions(start_date=now - timedelta(days=7), end_date=now)),
+        ("get_hackathons", lambda: db.get_hackathons(status="upcoming")),
+        ("join_hackathon", lambda: db.join_hackathon("u1", hackathon_id)),
+        ("update_dashboard_metrics", db.update_dashboard_metrics),
+        ("get_dashboard_metrics", db.get_dashboard_metrics),
+    ]
+
+
+def capture_selects(call):
+    """Run call and return the (sql, params) of every SELECT it issued"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def plan_problems(statement, parameters):
+    """Plan lines showing a full table scan or a temporary sort"""
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if detail.startswith("SCAN") and "USING" not in detail:
+            problems.append(detail)
+        elif "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+    return problems
+
+
+def check_query_plans():
+    """Return {query name: [problems]} for every query that misses an index"""
+    init_db()
+    hackathon_id = seed()
+    failures = {}
+    for name, call in workload(hackathon_id):
+        if name in FULL_SCAN_ALLOWED:
+            continue
+        for statement, parameters in capture_selects(call):
+            problems = plan_problems(statement, parameters)
+            if problems:
+                failures.setdefault(name, []).extend(problems)
+    return failures
+
+
+def test_queries_use_indexes():
+    failures = check_query_plans()
+    assert not failures, f"Queries without a usable index: {failures}"
+
+
+if __name__ == "__main__":
+    failures = check_query_plans()
+    if failures:
+        for name, problems in failures.items():
+            print(f"❌ {name}: {'; '.join(problems)}")
+        sys.exit(1)
+    print("✅ Every checked query uses an index")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Checks for the compiled skill matcher: symbol-bearing terms (C++, C#,
+Node.js) match on their own boundaries, longer terms win over their
+prefixes, and compound terms also count as the shorter terms inside them.
+Works as a script or under pytest.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from skill_matcher import SkillMatcher, skill_matcher
+
+
+def test_symbol_terms():
+    assert skill_matcher.find_skills("Wrote C++ and C# services") == ["C#", "C++"]
+    assert skill_matcher.find_skills("c++, c#.") == ["C#", "C++"]
+    # Part of a longer word is not a mention
+    assert skill_matcher.find_skills("abc++ and xc#") == []
+    assert skill_matcher.find_skills("Node.js APIs") == ["Node.js"]
+    assert skill_matcher.find_skills("node.jsx") == []
+    assert skill_matcher.find_skills("nodejs and node.js") == ["Node.js"]
+
+
+def test_prefixes_need_a_word_boundary():
+    assert skill_matcher.find_skills("JavaScript") == ["JavaScript"]
+    assert skill_matcher.find_skills("Java, JavaScript") == ["Java", "JavaScript"]
+    assert skill_matcher.find_skills("MySQL") == ["MySQL"]
+    assert skill_matcher.find_skills("python3 pythonic") == []
+
+
+def test_compound_terms_imply_their_parts():
+    assert skill_matcher.find_skills("React Native apps") == ["React", "React Native"]
+    assert skill_matcher.find_skills("SQL Server 2019") == ["SQL", "SQL Server"]
+    assert skill_matcher.find_skills("machine learning") == ["Machine Learning"]
+    # Aliases collapse to one canonical name
+    assert skill_matcher.find_skills("react.js, reactjs, React") == ["React"]
+
+
+def test_custom_vocabulary():
+    matcher = SkillMatcher({"langs": ["f#", "f", "f# interactive"]}, {"f#": "F#"})
+    assert matcher.find_skills("F# Interactive") == ["F", "F#", "F# Interactive"]
+    assert matcher.find_skills("f") == ["F"]
+    assert SkillMatcher({}).find_skills("anything") == []
+    # The version tracks the vocabulary, for cache invalidation
+    assert matcher.version != SkillMatcher({"langs": ["f#"]}).version
+
+
+if __name__ == "__main__":
+    for check in (test_symbol_terms, test_prefixes_need_a_word_boundary, test_compound_terms_imply_their_parts,
+                  test_custom_vocabulary):
+        check()
+        print(f"✅ {check.__name__}")